@@ -0,0 +1,48 @@
+import os
+from itertools import chain, islice
+from typing import Callable, Iterable, Iterator, List, Optional, TypeVar
+
+T = TypeVar('T')
+R = TypeVar('R')
+
+
+def map_chunks(func: Callable[[List[T]], R], items: Iterable[T], workers: Optional[int] = None,
+               chunk_size: int = 16, serial_below: int = 256) -> Iterator[R]:
+    """Yield func(chunk) for consecutive chunks of items, in input order.
+
+    items is consumed lazily and at most 2 * workers chunks are in flight; a
+    slow chunk holds back what is yielded, not what is submitted. If
+    the first serial_below items are all there is, or workers is 1, the chunks
+    run in this process instead, since starting a pool costs more than it saves.
+    """
+    items = iter(items)
+    workers = workers or os.cpu_count() or 1
+    head = list(islice(items, serial_below))
+    items = chain(head, items)
+    if workers == 1 or len(head) < serial_below:
+        while chunk := list(islice(items, chunk_size)):
+            yield func(chunk)
+        return
+
+    from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        # keep the pool busy with whichever chunks finish first, but park the
+        # results by sequence number so callers still see lines in file order
+        pending = {}
+        finished = {}
+        submitted = yielded = 0
+        while True:
+            chunk = list(islice(items, chunk_size))
+            if chunk:
+                pending[pool.submit(func, chunk)] = submitted
+                submitted += 1
+            if pending and (not chunk or len(pending) >= 2 * workers):
+                done, _ = wait(pending, return_when=FIRST_COMPLETED)
+                for fut in done:
+                    finished[pending.pop(fut)] = fut.result()
+                while yielded in finished:
+                    yield finished.pop(yielded)
+                    yielded += 1
+            if not chunk and not pending:
+                break
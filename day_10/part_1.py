@@ -1,113 +1,222 @@
 
 import os
 import re
-from typing import List, Optional, Tuple
+from typing import Iterator, List, Optional, Tuple
 from collections import defaultdict
 
+from parallel import map_chunks
 
-def parse_line(line: str) -> Tuple[int, int, List[int]]:
-    """Parse a single input line.
+# below this many rows a Four Russians table costs more than it saves
+M4RI_MIN_ROWS = 64
 
-    Returns (n, target_mask, button_masks)
-    - n: number of lights
-    - target_mask: int with bit i set if target light i should be ON
-    - button_masks: list of ints (length m) where bit i in button j indicates button j toggles light i
+_DIAGRAM = re.compile(r"\[([^\]]+)\]")
+_BUTTON = re.compile(r"\(([^)]+)\)")
+
+
+def parse_system(line: str) -> Tuple[int, int, List[int], List[int]]:
+    """parse_line plus the transposed matrix, built in the same pass.
+
+    Returns (n, target_mask, button_masks, rows) where rows[i] has bit j set
+    if button j toggles light i (what transpose_bits would give).
     """
     line = line.strip()
     if not line:
-        return 0, 0, []
+        return 0, 0, [], []
     # diagram between [ ]
-    m_diag = re.search(r"\[([^\]]+)\]", line)
+    m_diag = _DIAGRAM.search(line)
     if not m_diag:
         raise ValueError(f"No diagram found in line: {line}")
     diagram = m_diag.group(1)
     n = len(diagram)
     target_mask = 0
-    for i, ch in enumerate(diagram):
-        if ch == '#':
-            target_mask |= 1 << i
+    i = diagram.find('#')
+    while i >= 0:
+        target_mask |= 1 << i
+        i = diagram.find('#', i + 1)
 
-    # find all button groups like (0,2,3)
-    btns = re.findall(r"\(([^)]+)\)", line)
+    # find all button groups like (0,2,3); int() skips the spaces itself
+    rows = [0] * n
     button_masks: List[int] = []
-    for b in btns:
-        b = b.strip()
-        if b == "":
-            # empty parentheses (unlikely) -> no toggles
-            button_masks.append(0)
-            continue
-        parts = [p.strip() for p in b.split(',') if p.strip() != '']
+    for j, b in enumerate(_BUTTON.findall(line)):
+        try:
+            idxs = [int(p) for p in b.split(',')]
+        except ValueError:
+            # blank entries like "(1,,2)" or "( )": skip them
+            idxs = [int(p) for p in b.split(',') if p and not p.isspace()]
+        bit = 1 << j
         mask = 0
-        for p in parts:
-            # indices are zero-based
-            idx = int(p)
+        for idx in idxs:    # indices are zero-based
             if idx < 0 or idx >= n:
-                # still accept but avoid crashing
                 raise ValueError(f"Button index {idx} out of range for diagram length {n}")
             mask |= 1 << idx
+            rows[idx] |= bit
         button_masks.append(mask)
 
-    return n, target_mask, button_masks
+    return n, target_mask, button_masks, rows
+
+
+def parse_line(line: str) -> Tuple[int, int, List[int]]:
+    """Parse a single input line.
+
+    Returns (n, target_mask, button_masks)
+    - n: number of lights
+    - target_mask: int with bit i set if target light i should be ON
+    - button_masks: list of ints (length m) where bit i in button j indicates button j toggles light i
+    """
+    return parse_system(line)[:3]
+
+
+def transpose_bits(masks: List[int], n: int) -> List[int]:
+    """Transpose a bit matrix: column j of the result is masks[j] read as a row.
+
+    Walks only the set bits of each mask (lowest-bit tricks) instead of
+    testing every (row, column) position.
+    """
+    rows = [0] * n
+    for j, mask in enumerate(masks):
+        bit = 1 << j
+        while mask:
+            low = mask & -mask
+            rows[low.bit_length() - 1] |= bit
+            mask ^= low
+    return rows
+
+
+def _eliminate_plain(A: List[int], m: int) -> List[int]:
+    """Reduce A in place to reduced row echelon form, one pivot column at a time.
+
+    Each pivot clears its column from every other row in one comprehension,
+    which beats a lookup table until systems get large. Returns the pivot
+    columns; pivot row i ends up at A[i].
+    """
+    n = len(A)
+    pivot_cols: List[int] = []
+    r = 0
+    for c in range(m):
+        bit = 1 << c
+        for i in range(r, n):
+            if A[i] & bit:
+                break
+        else:
+            continue
+        pr = A[i]
+        A[i] = A[r]
+        A[:] = [a ^ pr if a & bit else a for a in A]
+        A[r] = pr
+        pivot_cols.append(c)
+        r += 1
+        if r == n:
+            break
+    return pivot_cols
 
 
-def gauss_mod2(rows: List[int], rhs: List[int], m: int) -> Optional[Tuple[int, List[int]]]:
+def _eliminate_m4ri(A: List[int], m: int, k: int, table: List[int]) -> List[int]:
+    """Method of Four Russians version of _eliminate_plain.
+
+    Columns go in windows of k. Pivots for a window are found by reducing
+    candidate rows against the window's pivots so far (at most k XORs per
+    row examined). Every other row, above and below, is then cleared with a
+    single lookup into a table of pivot-row combinations. The lookup is keyed
+    on the row's k-bit window, read with one shift and mask.
+    """
+    n = len(A)
+    pivot_cols: List[int] = []
+    r = 0
+    col = 0
+    while col < m and r < n:
+        base = col
+        width = min(k, m - base)
+        col += width
+        window = (1 << width) - 1
+        piv: List[Tuple[int, int]] = []    # (column, row), kept fully reduced
+        chosen = []
+        for i in range(r, n):
+            row = A[i]
+            for c, pr in piv:
+                if (row >> c) & 1:
+                    row ^= pr
+            w = (row >> base) & window
+            if not w:
+                continue
+            c = base + (w & -w).bit_length() - 1
+            piv = [(pc, pr ^ row if (pr >> c) & 1 else pr) for pc, pr in piv]
+            piv.append((c, row))
+            chosen.append(i)
+            if len(piv) == width:
+                break
+        if not piv:
+            continue
+        piv.sort()
+        taken = set(chosen)
+        A[r:] = [pr for _, pr in piv] + [A[i] for i in range(r, n) if i not in taken]
+        # table[w] = XOR of the pivot rows whose column is set in window value w
+        size = 1 << width
+        if len(table) < size:
+            table.extend([0] * (size - len(table)))
+        owner = [0] * width
+        for c, pr in piv:
+            owner[c - base] = pr
+        table[0] = 0
+        for s in range(1, size):
+            low = s & -s
+            table[s] = table[s ^ low] ^ owner[low.bit_length() - 1]
+        end = r + len(piv)
+        A[:r] = [a ^ table[(a >> base) & window] for a in A[:r]]
+        A[end:] = [a ^ table[(a >> base) & window] for a in A[end:]]
+        pivot_cols.extend(c for c, _ in piv)
+        r = end
+    return pivot_cols
+
+
+def gauss_mod2(rows: List[int], rhs: List[int], m: int,
+               table: Optional[List[int]] = None) -> Optional[Tuple[int, List[int]]]:
     """Gaussian elimination over GF(2).
 
     rows: list of row masks (length n), each mask has m bits for variables (buttons)
     rhs: list of right-hand side bits (length n)
     m: number of variables
+    table: optional scratch list reused across calls (see solve_machines)
+
+    Works on the augmented rows (rhs as bit m). Systems with at least
+    M4RI_MIN_ROWS rows use the Method of Four Russians (_eliminate_m4ri);
+    puzzle-sized ones use plain elimination, where building a table can't
+    pay for itself.
 
     Returns (particular_solution_mask, nullspace_basis_list) or None if unsolvable.
     particular_solution_mask is an int of m bits (free vars = 0 by default)
     nullspace_basis_list is a list of int masks (each m bits)
     """
     n = len(rows)
-    # make copies
-    A = rows[:]  # row masks
-    b = rhs[:]
-
-    pivot_row_for_col = {}  # col -> row index
-    r = 0
-    for col in range(m):
-        # find pivot
-        pivot = None
-        for i in range(r, n):
-            if (A[i] >> col) & 1:
-                pivot = i
-                break
-        if pivot is None:
-            continue
-        # swap
-        A[r], A[pivot] = A[pivot], A[r]
-        b[r], b[pivot] = b[pivot], b[r]
-        pivot_row_for_col[col] = r
-        # eliminate other rows
-        for i in range(n):
-            if i != r and ((A[i] >> col) & 1):
-                A[i] ^= A[r]
-                b[i] ^= b[r]
-        r += 1
+    A = [row | (bit << m) for row, bit in zip(rows, rhs)]
+    if n >= M4RI_MIN_ROWS:
+        if table is None:
+            table = []
+        k = max(1, min(8, (n.bit_length() - 1)))    # strip width ~ log2(n)
+        pivot_cols = _eliminate_m4ri(A, m, k, table)
+    else:
+        pivot_cols = _eliminate_plain(A, m)
+    r = len(pivot_cols)
 
     # check for inconsistency: 0 == 1
     for i in range(r, n):
-        if A[i] == 0 and b[i] == 1:
+        if A[i] == 1 << m:
             return None
 
     # construct particular solution with free vars = 0
     x = 0
-    for col, row in pivot_row_for_col.items():
-        if b[row]:
+    for row, col in enumerate(pivot_cols):
+        if (A[row] >> m) & 1:
             x |= 1 << col
 
     # nullspace basis: for each free col f, basis vector has 1 at f, and for each pivot col p
     # set bit p if pivot row has bit f set (because p depends on free variables)
     basis: List[int] = []
-    pivot_cols = set(pivot_row_for_col.keys())
+    pivot_set = set(pivot_cols)
     for f in range(m):
-        if f in pivot_cols:
+        if f in pivot_set:
             continue
         vec = 1 << f
-        for p, row in pivot_row_for_col.items():
+        for row, p in enumerate(pivot_cols):
             if (A[row] >> f) & 1:
                 vec |= 1 << p
         basis.append(vec)
@@ -115,11 +224,146 @@ def gauss_mod2(rows: List[int], rhs: List[int], m: int) -> Optional[Tuple[int, L
     return x, basis
 
 
-def min_weight_solution(particular: int, basis: List[int], cutoff: int = 26) -> int:
+def gray_code_xors(vectors: List[int]) -> Iterator[Tuple[int, int]]:
+    """Yield (xor, size) for every subset of vectors, in Gray-code order.
+
+    Consecutive Gray codes differ in one bit, so each step is a single XOR
+    with one vector instead of rebuilding the subset's XOR from scratch.
+    """
+    xorv = 0
+    size = 0
+    yield xorv, size
+    for s in range(1, 1 << len(vectors)):
+        bit = (s & -s).bit_length() - 1
+        xorv ^= vectors[bit]
+        size += 1 if ((s ^ (s >> 1)) >> bit) & 1 else -1
+        yield xorv, size
+
+
+def _split_leading_bits(particular: int, basis: List[int]) -> Tuple[int, List[int], int]:
+    """Reduce the basis so each vector owns one bit no other vector (or particular) has.
+
+    Returns (particular, basis, other_mask) where other_mask covers every bit
+    that isn't an owned bit. Then for any subset S,
+    popcount(particular ^ xor(S)) == |S| + popcount((particular ^ xor(S)) & other_mask).
+    """
+    reduced: List[int] = []
+    for v in basis:
+        for u in reduced:
+            if v & (1 << (u.bit_length() - 1)):
+                v ^= u
+        if not v:
+            continue
+        lead = 1 << (v.bit_length() - 1)
+        reduced = [u ^ v if u & lead else u for u in reduced]
+        reduced.append(v)
+    leading = 0
+    for u in reduced:
+        lead = 1 << (u.bit_length() - 1)
+        leading |= lead
+        if particular & lead:
+            particular ^= u
+    width = max([particular.bit_length()] + [u.bit_length() for u in reduced])
+    return particular, reduced, ((1 << width) - 1) & ~leading
+
+
+def _compress(v: int, positions: List[int]) -> int:
+    out = 0
+    for t, p in enumerate(positions):
+        if (v >> p) & 1:
+            out |= 1 << t
+    return out
+
+
+def min_weight_coset(particular: int, basis: List[int],
+                     time_budget: Optional[float] = None) -> Tuple[int, int]:
+    """Exact minimum popcount over particular + span(basis), Brouwer-Zimmermann style.
+
+    The basis is brought into systematic form on several information sets
+    (pivot columns), each picked to avoid columns earlier ones used. Level w
+    tries every w-subset of rows in every form. A vector not reached by level
+    w has more than w pivot bits set in every form, which puts at least
+    max(0, w + 1 - (k - r_j)) ones on the r_j fresh columns of form j; summing
+    over forms gives a lower bound, and the search stops once the best weight
+    found meets it.
+
+    Returns (best, lower_bound); they are equal unless time_budget (seconds)
+    ran out first.
+    """
+    from time import perf_counter
+
+    deadline = None if time_budget is None else perf_counter() + time_budget
+    width = max([particular.bit_length()] + [v.bit_length() for v in basis])
+
+    forms = []        # (rows, reduced particular, fresh pivot count)
+    used = 0
+    while True:
+        rows: List[int] = []
+        pivots: List[int] = []
+        fresh = 0
+        for v in basis:
+            for row, p in zip(rows, pivots):
+                if (v >> p) & 1:
+                    v ^= row
+            if not v:
+                continue
+            unused = v & ~used
+            p = (unused if unused else v).bit_length() - 1
+            fresh += 1 if unused else 0
+            rows = [row ^ v if (row >> p) & 1 else row for row in rows]
+            rows.append(v)
+            pivots.append(p)
+        if not forms or fresh:
+            reduced = particular
+            for row, p in zip(rows, pivots):
+                if (reduced >> p) & 1:
+                    reduced ^= row
+            forms.append((rows, reduced, fresh))
+        for p in pivots:
+            used |= 1 << p
+        if not fresh or used == (1 << width) - 1:
+            break
+
+    k = len(forms[0][0])
+
+    def level(x: int, rows: List[int], start: int, depth: int) -> int:
+        # lightest x ^ (depth rows taken from rows[start:]); the innermost row is
+        # swept in one comprehension so each candidate costs a single xor
+        if depth == 1:
+            return min(map(int.bit_count, [x ^ r for r in rows[start:]]))
+        if depth == 2 and deadline is not None and perf_counter() > deadline:
+            raise TimeoutError
+        return min(level(x ^ rows[i], rows, i + 1, depth - 1)
+                   for i in range(start, k - depth + 1))
+
+    best = min(reduced.bit_count() for _, reduced, _ in forms)
+    lower = 0
+    for w in range(1, k + 1):
+        for rows, reduced, _ in forms:
+            try:
+                best = min(best, level(reduced, rows, 0, w))
+            except TimeoutError:
+                return best, lower
+        if deadline is not None and perf_counter() > deadline:
+            return best, lower
+        lower = sum(max(0, w + 1 - (k - fresh)) for _, _, fresh in forms)
+        if best <= lower:
+            return best, best
+    return best, best
+
+
+def min_weight_solution(particular: int, basis: List[int], cutoff: int = 26,
+                        time_budget: Optional[float] = None, cube_bits: int = 24,
+                        scan_limit: int = 1 << 22) -> int:
     """Enumerate the affine space particular + span(basis) to find minimal popcount.
 
     If the nullspace dimension is too large (> cutoff), this will still attempt enumeration
     but may be slow. Default cutoff is conservative; if you expect larger, increase it.
+    Past the cutoff, a meet-in-the-middle join is used; its distance cube needs at most
+    cube_bits leftover bits, and its direct scan at most scan_limit comparisons. Past
+    40, or when neither join fits, it switches to min_weight_coset; time_budget caps
+    that search, in which case the best weight found so far is returned (call
+    min_weight_coset directly to also get the lower bound).
     Returns minimal popcount (number of button presses modulo parity).
     """
     k = len(basis)
@@ -128,86 +372,68 @@ def min_weight_solution(particular: int, basis: List[int], cutoff: int = 26) ->
     if k > cutoff:
         # fallback: use meet-in-the-middle over the basis if dimension is reasonable
         if k <= 40:
-            # we need to find v in span(basis) that minimizes popcount(particular ^ v)
-            # do meet-in-the-middle on basis vectors: enumerate left/right spans and
-            # for each left store map from xor -> minimal popcount of combined vector on that half,
-            # then combine with right to compute full vector popcount.
-            m = 0
-            # determine number of bits in vectors (m) from highest bit in basis or particular
-            for v in basis:
-                if v:
-                    m = max(m, v.bit_length())
-            m = max(m, particular.bit_length())
-
-            half = k // 2
-            left = basis[:half]
-            right = basis[half:]
-
-            left_map = {}
-            for s in range(1 << len(left)):
-                xorv = 0
-                i = 0
-                ss = s
-                while ss:
-                    if ss & 1:
-                        xorv ^= left[i]
-                    ss >>= 1
-                    i += 1
-                vec = particular ^ xorv
-                pc = vec.bit_count()
-                if xorv not in left_map or pc < left_map[xorv]:
-                    left_map[xorv] = pc
-
+            # Put the basis in a form where every vector owns one bit, so the weight of
+            # particular ^ xor(S) is |S| plus the popcount of the remaining ("other") bits.
+            # Squash those other bits down to r dense bits.
+            particular, basis, other_mask = _split_leading_bits(particular, basis)
+            positions = [p for p in range(other_mask.bit_length()) if (other_mask >> p) & 1]
+            target = _compress(particular, positions)
+            squashed = [_compress(v, positions) for v in basis]
+            half = len(squashed) // 2
+            left, right = squashed[:half], squashed[half:]
+            r = len(positions)
+
+            # sorted-array join: one (pattern, size) entry per left subset, sorted so the
+            # cheapest subset for each pattern comes first
+            left_entries = sorted(gray_code_xors(left))
+            best_left = {}
+            for pattern, size in left_entries:
+                if pattern not in best_left:
+                    best_left[pattern] = size
+
+            # the cube pass costs r * 2^r, comparing directly costs 2^|right| * |best_left|;
+            # the cube is also a 2^r list, so it is only built for r <= cube_bits
+            scan_cost = (1 << len(right)) * len(best_left)
+            if r <= cube_bits and r * (1 << r) <= scan_cost:
+                # dist[v] = min over left patterns c of size(c) + popcount(v ^ c),
+                # filled in with one pass per bit over the r-bit cube
+                inf = k + r + 1
+                dist = [inf] * (1 << r)
+                for pattern, size in best_left.items():
+                    dist[pattern] = size
+                for b in range(r):
+                    step = 1 << b
+                    for v in range(1 << r):
+                        if v & step:
+                            lo, hi = dist[v ^ step], dist[v]
+                            if hi + 1 < lo:
+                                dist[v ^ step] = hi + 1
+                            elif lo + 1 < hi:
+                                dist[v] = lo + 1
+                return min(size + dist[target ^ pattern] for pattern, size in gray_code_xors(right))
+
+            # too many other bits for the cube: comparing against each distinct left
+            # pattern is quadratic, so only do it while that stays small
+            if scan_cost > scan_limit:
+                best_w, _ = min_weight_coset(particular, basis, time_budget)
+                return best_w
             best_w = None
-            for s in range(1 << len(right)):
-                xorv = 0
-                i = 0
-                ss = s
-                while ss:
-                    if ss & 1:
-                        xorv ^= right[i]
-                    ss >>= 1
-                    i += 1
-                # for this right xorv, combined vector is particular ^ xorv ^ xor_left
-                # we need minimal over xor_left; iterate left_map entries
-                for xor_left, pc_left in left_map.items():
-                    total_pc = pc_left if xor_left == 0 else None
-                    # Instead of recomputing fully, compute final popcount directly
-                    cand_vec = particular ^ xor_left ^ xorv
-                    total_pc = cand_vec.bit_count()
-                    if best_w is None or total_pc < best_w:
-                        best_w = total_pc
-            return best_w if best_w is not None else particular.bit_count()
-        # otherwise fall back to greedy hill-climb
-        best = particular
-        best_w = best.bit_count()
-        improved = True
-        while improved:
-            improved = False
-            for v in basis:
-                cand = best ^ v
-                w = cand.bit_count()
-                if w < best_w:
-                    best = cand
-                    best_w = w
-                    improved = True
+            for pattern, size in gray_code_xors(right):
+                need = target ^ pattern
+                for left_pattern, left_size in best_left.items():
+                    w = size + left_size + (need ^ left_pattern).bit_count()
+                    if best_w is None or w < best_w:
+                        best_w = w
+            return best_w
+        # otherwise search exactly with information sets
+        best_w, _ = min_weight_coset(particular, basis, time_budget)
         return best_w
 
-    best = None
     best_w = None
-    for mask in range(1 << k):
-        s = particular
-        msk = mask
-        i = 0
-        while msk:
-            if msk & 1:
-                s ^= basis[i]
-            msk >>= 1
-            i += 1
-        w = s.bit_count()
+    for xorv, _ in gray_code_xors(basis):
+        w = (particular ^ xorv).bit_count()
         if best_w is None or w < best_w:
             best_w = w
-            best = s
     return best_w if best_w is not None else 0
 
 
@@ -227,32 +453,15 @@ def mitm_min_presses(button_masks: List[int], target: int) -> int:
     right = button_masks[m1:]
 
     left_map = {}
-    for s in range(1 << len(left)):
-        xorv = 0
-        i = 0
-        ss = s
-        while ss:
-            if ss & 1:
-                xorv ^= left[i]
-            ss >>= 1
-            i += 1
-        pc = s.bit_count()
+    for xorv, pc in gray_code_xors(left):
         if xorv not in left_map or pc < left_map[xorv]:
             left_map[xorv] = pc
 
     best = None
-    for s in range(1 << len(right)):
-        xorv = 0
-        i = 0
-        ss = s
-        while ss:
-            if ss & 1:
-                xorv ^= right[i]
-            ss >>= 1
-            i += 1
+    for xorv, pc in gray_code_xors(right):
         need = target ^ xorv
         if need in left_map:
-            total_pc = left_map[need] + s.bit_count()
+            total_pc = left_map[need] + pc
             if best is None or total_pc < best:
                 best = total_pc
 
@@ -261,9 +470,9 @@ def mitm_min_presses(button_masks: List[int], target: int) -> int:
     return best
 
 
-def solve_machine(line: str) -> int:
+def solve_machine(line: str, table: Optional[List[int]] = None) -> int:
     """Solve one machine line and return minimal number of presses required."""
-    n, target_mask, button_masks = parse_line(line)
+    n, target_mask, button_masks, rows = parse_system(line)
     m = len(button_masks)
     if n == 0:
         return 0
@@ -273,43 +482,41 @@ def solve_machine(line: str) -> int:
             return 0
         raise ValueError("Unsolvable machine: no buttons but target requires lights on")
 
-    # build rows: for each light i (0..n-1), set bits for buttons that toggle that light
-    rows = []
-    rhs = []
-    for i in range(n):
-        row = 0
-        for j, bmask in enumerate(button_masks):
-            if (bmask >> i) & 1:
-                row |= 1 << j
-        rows.append(row)
-        rhs.append((target_mask >> i) & 1)
-
-    # If number of buttons is moderate, use meet-in-the-middle directly (fast and exact).
-    # This avoids enumerating the nullspace if it's large.
-    if m <= 40:
-        # build button_masks and call MITM directly
-        try:
-            return mitm_min_presses(button_masks, target_mask)
-        except ValueError:
-            # fall back to elimination to detect inconsistency more robustly
-            pass
+    # rows: for each light i (0..n-1), bit j set if button j toggles that light
+    rhs = [(target_mask >> i) & 1 for i in range(n)]
 
-    res = gauss_mod2(rows, rhs, m)
+    res = gauss_mod2(rows, rhs, m, table)
     if res is None:
         raise ValueError("Unsolvable machine: inconsistent system")
     particular, basis = res
+    # Enumerating the nullspace costs 2^k; meet-in-the-middle over the raw
+    # buttons costs about 2 * 2^(m/2). Pick whichever is smaller.
+    if m <= 40 and len(basis) > m // 2 + 1:
+        return mitm_min_presses(button_masks, target_mask)
     return min_weight_solution(particular, basis)
 
 
-def solve_file(path: str) -> int:
-    total = 0
+def solve_machines(lines) -> Iterator[int]:
+    """Solve a batch of machine lines, sharing one elimination scratch table."""
+    table: List[int] = []
+    for line in lines:
+        line = line.strip()
+        if line:
+            yield solve_machine(line, table)
+
+
+def _solve_chunk(lines: List[str]) -> int:
+    return sum(solve_machines(lines))
+
+
+def solve_file(path: str, workers: Optional[int] = None) -> int:
+    """Total presses for every machine in the file, spread over a process pool.
+
+    Machines here take well under a millisecond, so a pool only pays for
+    itself on inputs far bigger than a normal puzzle.
+    """
     with open(path, 'r') as fh:
-        for line in fh:
-            line = line.strip()
-            if not line:
-                continue
-            total += solve_machine(line)
-    return total
+        return sum(map_chunks(_solve_chunk, fh, workers, chunk_size=256, serial_below=4096))
 
 
 def main():
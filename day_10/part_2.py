@@ -1,7 +1,287 @@
 import re
-import pulp
+from functools import partial
+from math import ceil, gcd
+
+from parallel import map_chunks
+
+# search nodes the native solver spends on one line (a few seconds at most)
+# before handing it to CBC
+NATIVE_MAX_NODES = 20000
+
+
+def _eliminate(buttons, targets):
+    """Integer row reduction of the light/button system.
+
+    Returns (rows, pivots), where each row is [coefficients..., rhs] with a
+    positive coefficient on its own pivot column and zeros on every other
+    pivot column, or None when the system is inconsistent. Rows are kept
+    fraction-free by cross-multiplying and dividing out the gcd.
+    """
+    m = len(targets)
+    k = len(buttons)
+    rows = [[1 if p in buttons[j] else 0 for j in range(k)] + [targets[p]] for p in range(m)]
+    pivots = []
+    for col in range(k):
+        r = next((i for i in range(len(pivots), m) if rows[i][col]), None)
+        if r is None:
+            continue
+        rank = len(pivots)
+        rows[rank], rows[r] = rows[r], rows[rank]
+        pivot_row = rows[rank]
+        if pivot_row[col] < 0:
+            pivot_row[:] = [-v for v in pivot_row]
+        a = pivot_row[col]
+        for i in range(m):
+            c = rows[i][col]
+            if i == rank or not c:
+                continue
+            row = [a * v - c * w for v, w in zip(rows[i], pivot_row)]
+            g = 0
+            for v in row:
+                g = gcd(g, v)
+            rows[i] = [v // g for v in row] if g > 1 else row
+        pivots.append(col)
+    rank = len(pivots)
+    if any(row[-1] for row in rows[rank:]):
+        return None
+    return rows[:rank], pivots
+
+
+def _lp_min(cost, G, h, eps=1e-9):
+    """min cost . y subject to G y <= h, y >= 0, by two-phase dense simplex.
+
+    Floats with Bland's rule; returns (optimum, y), or None when the system is
+    clearly infeasible. Only used to bound and steer the branch and bound, so
+    callers leave some slack for rounding.
+    """
+    m = len(G)
+    n = len(cost)
+    flipped = [i for i in range(m) if h[i] < 0]
+    width = n + m + len(flipped)
+    T = []
+    basis = []
+    for i in range(m):
+        row = list(G[i]) + [0.0] * (m + len(flipped)) + [h[i]]
+        row[n + i] = 1.0
+        if h[i] < 0:
+            row = [-v for v in row]
+        T.append(row)
+        basis.append(n + i)
+    for t, i in enumerate(flipped):
+        T[i][n + m + t] = 1.0
+        basis[i] = n + m + t
+
+    def run(obj, allowed):
+        while True:
+            enter = None
+            for j in range(allowed):
+                d = obj[j] - sum(obj[basis[i]] * T[i][j] for i in range(len(T)))
+                if d < -eps:
+                    enter = j
+                    break
+            if enter is None:
+                return sum(obj[basis[i]] * T[i][-1] for i in range(len(T)))
+            leave = None
+            for i in range(len(T)):
+                a = T[i][enter]
+                if a > eps:
+                    ratio = T[i][-1] / a
+                    if leave is None or ratio < best_ratio - eps or (
+                            ratio <= best_ratio + eps and basis[i] < basis[leave]):
+                        leave, best_ratio = i, ratio
+            if leave is None:
+                return float('-inf')
+            pivot(leave, enter)
+
+    def pivot(r, c):
+        pr = T[r]
+        a = pr[c]
+        pr[:] = [v / a for v in pr]
+        for i in range(len(T)):
+            if i != r and T[i][c]:
+                f = T[i][c]
+                T[i] = [v - f * w for v, w in zip(T[i], pr)]
+        basis[r] = c
+
+    if flipped:
+        if run([0.0] * (n + m) + [1.0] * len(flipped), width) > 1e-7:
+            return None
+        # pivot leftover artificials out, dropping rows that turned out redundant
+        for i in range(len(T) - 1, -1, -1):
+            if basis[i] >= n + m:
+                col = next((j for j in range(n + m) if abs(T[i][j]) > eps), None)
+                if col is None:
+                    del T[i], basis[i]
+                else:
+                    pivot(i, col)
+    value = run(list(cost) + [0.0] * (width - n), n + m)
+    y = [0.0] * n
+    for i, b in enumerate(basis):
+        if b < n:
+            y[b] = T[i][-1]
+    return value, y
+
+
+def solve_min_presses_native(buttons, targets, max_nodes=None):
+    """Fewest presses with pivot presses written in terms of the free ones.
+
+    After elimination, every pivot press is (rhs - sum c * free) / a, so only
+    the few free presses are searched. Each starts bounded by the smallest
+    target among the lights it feeds. At every node the rows' requirement that
+    their pivot lands in [0, its bound] is propagated into the free presses'
+    ranges until nothing tightens. The total, which is linear in the free
+    presses, then gives a lower bound over what is left, and the search
+    branches on the free press with the fewest values remaining. Returns None
+    when no non-negative integer solution exists.
+
+    This is still exponential in the worst case; past max_nodes search nodes
+    the line is handed to solve_min_presses_pulp instead.
+    """
+    m = len(targets)
+    # buttons wired to the same lights are interchangeable, so keep one of each;
+    # otherwise the search wanders through every way of splitting presses among them
+    buttons = sorted({frozenset(p for p in b if p < m) for b in buttons}, key=sorted)
+    k = len(buttons)
+    upper = [min((targets[p] for p in b), default=0) for b in buttons]
+    reduced = _eliminate(buttons, targets)
+    if reduced is None:
+        return None
+    rows, pivots = reduced
+    pivot_set = set(pivots)
+    free = [j for j in range(k) if j not in pivot_set]
+    nf = len(free)
+    n_rows = len(rows)
+    coef = [[row[j] for j in free] for row in rows]
+    rhs = [row[-1] for row in rows]
+    diag = [row[col] for row, col in zip(rows, pivots)]
+    cap = [a * upper[col] for a, col in zip(diag, pivots)]
+
+    # the total scaled by lcm(diag) is base + sum slope[f] * free press f
+    scale = 1
+    for a in diag:
+        scale = scale * a // gcd(scale, a)
+    weight = [scale // a for a in diag]
+    base = sum(w * r for w, r in zip(weight, rhs))
+    slope = [scale - sum(w * c[f] for w, c in zip(weight, coef)) for f in range(nf)]
+
+    def tighten(lo, hi):
+        # pivot i = (rhs - sum c * free) / a must stay in [0, upper], so
+        # sum c * free lies in [rhs - cap, rhs]; push that onto each free range
+        changed = True
+        while changed:
+            changed = False
+            for i in range(n_rows):
+                c, r = coef[i], rhs[i]
+                low = [min(c[f] * lo[f], c[f] * hi[f]) for f in range(nf)]
+                high = [max(c[f] * lo[f], c[f] * hi[f]) for f in range(nf)]
+                s_lo, s_hi = sum(low), sum(high)
+                if s_lo > r or s_hi < r - cap[i]:
+                    return False
+                for f in range(nf):
+                    cf = c[f]
+                    if not cf or lo[f] == hi[f]:
+                        continue
+                    want_lo = r - cap[i] - (s_hi - high[f])
+                    want_hi = r - (s_lo - low[f])
+                    if cf > 0:
+                        new_lo, new_hi = -(-want_lo // cf), want_hi // cf
+                    else:
+                        new_lo, new_hi = -(-want_hi // cf), want_lo // cf
+                    if new_lo > lo[f]:
+                        lo[f] = new_lo
+                        changed = True
+                    if new_hi < hi[f]:
+                        hi[f] = new_hi
+                        changed = True
+                    if lo[f] > hi[f]:
+                        return False
+        return True
+
+    def total_if_integral(values):
+        total = sum(values)
+        for i in range(n_rows):
+            q, rem = divmod(rhs[i] - sum(c * v for c, v in zip(coef[i], values)), diag[i])
+            if rem:
+                return None
+            total += q
+        return total
+
+    def cheapest_first(f, lo, hi):
+        return range(lo[f], hi[f] + 1) if slope[f] >= 0 else range(hi[f], lo[f] - 1, -1)
+
+    best = None
+    nodes = 0
+
+    def search(lo, hi):
+        nonlocal best, nodes
+        nodes += 1
+        if max_nodes is not None and nodes > max_nodes:
+            raise TimeoutError
+        if not tighten(lo, hi):
+            return
+        bound = base + sum(min(s * l, s * h) for s, l, h in zip(slope, lo, hi))
+        if best is not None and -(-bound // scale) >= best:
+            return
+        open_ = [f for f in range(nf) if lo[f] < hi[f]]
+        if not open_:
+            total = total_if_integral(lo)
+            if total is not None and (best is None or total < best):
+                best = total
+            return
+        centre = {}
+        if len(open_) > 1:
+            # LP relaxation over the open presses, shifted so they start at lo
+            fixed = [sum(c[g] * lo[g] for g in range(nf)) for c in coef]
+            G, h = [], []
+            for i in range(n_rows):
+                G.append([coef[i][g] for g in open_])
+                h.append(rhs[i] - fixed[i])
+                G.append([-coef[i][g] for g in open_])
+                h.append(cap[i] - rhs[i] + fixed[i])
+            for t, g in enumerate(open_):
+                G.append([1 if u == t else 0 for u in range(len(open_))])
+                h.append(hi[g] - lo[g])
+            relaxed = _lp_min([slope[g] for g in open_], G, h)
+            if relaxed is None:
+                return
+            value, y = relaxed
+            bound = base + sum(s * l for s, l in zip(slope, lo)) + value
+            if best is not None and ceil(bound / scale - 1e-6) >= best:
+                return
+            centre = {g: lo[g] + y[t] for t, g in enumerate(open_)}
+        f = min(open_, key=lambda g: hi[g] - lo[g])
+        if len(open_) == 1:
+            # with the rest fixed the total is linear in this press, so the
+            # first value from the cheap end that keeps every pivot integral wins
+            values = lo[:]
+            for v in cheapest_first(f, lo, hi):
+                values[f] = v
+                total = total_if_integral(values)
+                if total is not None:
+                    if best is None or total < best:
+                        best = total
+                    return
+            return
+        values = cheapest_first(f, lo, hi)
+        if f in centre:
+            # values nearest the LP optimum first, so good totals turn up early
+            values = sorted(values, key=lambda v: abs(v - centre[f]))
+        for v in values:
+            sub_lo, sub_hi = lo[:], hi[:]
+            sub_lo[f] = sub_hi[f] = v
+            search(sub_lo, sub_hi)
+
+    try:
+        search([0] * nf, [upper[j] for j in free])
+    except TimeoutError:
+        # too many free presses for this search; let CBC have it
+        return solve_min_presses_pulp(buttons, targets)
+    return best
+
+
+def solve_min_presses_pulp(buttons, targets):
+    import pulp     # only needed to cross-check the native solver
 
-def solve_min_presses(buttons, targets):
     m = len(targets)
     k = len(buttons)
     prob = pulp.LpProblem("MinPresses", pulp.LpMinimize)
@@ -11,51 +291,79 @@ def solve_min_presses(buttons, targets):
         prob += pulp.lpSum(x[j] for j in range(k) if p in buttons[j]) == targets[p]
     status = prob.solve(pulp.PULP_CBC_CMD(msg=0))
     if status != 1:
-        print("unsolvable, something went wrong")
-        assert False
+        return None
     return int(pulp.value(prob.objective))
 
-def main():
-    with open("input.txt", "r") as infile:
-        data = infile.read().splitlines()
 
-    presses_p2 = 0
+def solve_min_presses(buttons, targets, backend="native"):
+    if backend == "pulp":
+        presses = solve_min_presses_pulp(buttons, targets)
+    elif backend == "check":
+        presses = solve_min_presses_native(buttons, targets)
+        expected = solve_min_presses_pulp(buttons, targets)
+        if presses != expected:
+            raise AssertionError(f"native solver gave {presses}, PuLP gave {expected}")
+    else:
+        presses = solve_min_presses_native(buttons, targets, NATIVE_MAX_NODES)
+    if presses is None:
+        # raised rather than printed: this may run in a pool worker, and
+        # solve_line reports it with the line number
+        raise AssertionError("unsolvable, something went wrong")
+    return presses
 
-    for lineno, line in enumerate(data, start=1):
-        if not line or not line.strip():
-            continue
+def solve_line(lineno, line, backend="native"):
+    """Solve one input line; returns (presses or None, message to print or None)."""
+    if not line or not line.strip():
+        return None, None
 
-        # parse indicator (not used for this part), buttons, and target vector
-        m_ind = re.search(r"\[(.*?)\]", line)
-        m_j = re.search(r"\{(.*?)\}", line)
-        if not m_j:
-            print(f"line {lineno}: missing target vector, skipping")
-            continue
+    # parse indicator (not used for this part), buttons, and target vector
+    m_ind = re.search(r"\[(.*?)\]", line)
+    m_j = re.search(r"\{(.*?)\}", line)
+    if not m_j:
+        return None, f"line {lineno}: missing target vector, skipping"
 
-        wiring_groups = re.findall(r"\((.*?)\)", line)
-        wiring = []
-        for s in wiring_groups:
-            nums = re.findall(r"\d+", s)
-            if not nums:
-                wiring.append([])
-            else:
-                wiring.append([int(x) for x in nums])
-
-        joltage_ints = [int(x) for x in re.findall(r"\d+", m_j.group(1))]
-
-        try:
-            val = solve_min_presses(wiring, joltage_ints)
-        except AssertionError:
-            print(f"line {lineno}: unsolvable or solver error, skipping")
-            continue
-        except Exception as e:
-            print(f"line {lineno}: solver raised exception: {e}")
-            continue
+    wiring_groups = re.findall(r"\((.*?)\)", line)
+    wiring = []
+    for s in wiring_groups:
+        nums = re.findall(r"\d+", s)
+        if not nums:
+            wiring.append([])
+        else:
+            wiring.append([int(x) for x in nums])
+
+    joltage_ints = [int(x) for x in re.findall(r"\d+", m_j.group(1))]
+
+    try:
+        return solve_min_presses(wiring, joltage_ints, backend), None
+    except AssertionError:
+        return None, f"line {lineno}: unsolvable or solver error, skipping"
+    except Exception as e:
+        return None, f"line {lineno}: solver raised exception: {e}"
+
+
+def solve_chunk(numbered_lines, backend="native"):
+    return [(lineno, *solve_line(lineno, line, backend)) for lineno, line in numbered_lines]
+
+
+def main(path="input.txt", workers=None, backend="native"):
+    presses_p2 = 0
 
-        presses_p2 += val
+    # map_chunks hands chunks back in file order, so messages print in line order
+    with open(path, "r") as infile:
+        numbered = enumerate((line.rstrip("\n") for line in infile), start=1)
+        for results in map_chunks(partial(solve_chunk, backend=backend), numbered, workers):
+            for lineno, val, message in results:
+                if message:
+                    print(message)
+                if val is not None:
+                    presses_p2 += val
 
     print(presses_p2)
 
 
 if __name__ == "__main__":
-    main()
\ No newline at end of file
+    import sys
+    args = [a for a in sys.argv[1:] if not a.startswith("--")]
+    # --pulp solves with CBC as before, --check runs both and compares
+    backend = "check" if "--check" in sys.argv[1:] else "pulp" if "--pulp" in sys.argv[1:] else "native"
+    main(*args[:1], backend=backend)
@@ -12,16 +12,50 @@ def repeating_pattern(s):
     return False
 
 
-
-total_invalid_sum = 0
-
-for start, end in list_of_ranges:
+def sum_invalid_ids_bruteforce(start: int, end: int) -> int:
+    """Old per-ID scan, kept to cross-check sum_invalid_ids on small ranges."""
+    total = 0
     for id_num in range(start, end + 1):
-            s = str(id_num)
-            if repeating_pattern(s):
-                  total_invalid_sum += id_num
-
-
-
-
-print(total_invalid_sum)
\ No newline at end of file
+        if repeating_pattern(str(id_num)):
+            total += id_num
+    return total
+
+
+def _sum_periodic(lo: int, hi: int, n: int, period: int) -> int:
+    # every n-digit number made of one `period`-digit block repeated is block * multiplier,
+    # so the blocks that land inside [lo, hi] form a contiguous run we can sum directly
+    multiplier = (10 ** n - 1) // (10 ** period - 1)
+    first = max(10 ** (period - 1), -(-lo // multiplier))
+    last = min(10 ** period - 1, hi // multiplier)
+    if first > last:
+        return 0
+    return multiplier * (first + last) * (last - first + 1) // 2
+
+
+def sum_invalid_ids(start: int, end: int) -> int:
+    """Sum every ID in [start, end] made of a digit block repeated at least twice."""
+    total = 0
+    for n in range(len(str(max(start, 1))), len(str(end)) + 1):
+        lo = max(start, 10 ** (n - 1))
+        hi = min(end, 10 ** n - 1)
+        if lo > hi:
+            continue
+        # exact[p] = sum of numbers whose *smallest* repeating block has length p.
+        # a number with block length p also has block length q for every multiple q of p,
+        # so subtract the smaller divisors back out (inclusion-exclusion over periods)
+        exact = {}
+        for p in range(1, n // 2 + 1):
+            if n % p:
+                continue
+            exact[p] = _sum_periodic(lo, hi, n, p) - sum(v for d, v in exact.items() if p % d == 0)
+            total += exact[p]
+    return total
+
+
+if __name__ == "__main__":
+    total_invalid_sum = 0
+
+    for start, end in list_of_ranges:
+        total_invalid_sum += sum_invalid_ids(start, end)
+
+    print(total_invalid_sum)
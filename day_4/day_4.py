@@ -1,3 +1,9 @@
+import re
+
+try:
+    import numpy as np
+except ImportError:      # numpy backend is optional, pure Python path still works
+    np = None
 
 # Part 1
 def parse_grid(paper_grid: str):
@@ -25,6 +31,8 @@ def accessible_count(grid, roll='@'):    # Count accessible positions
                 total += 1
     return total
 
+count_accessible_once = accessible_count    # part 2 below reuses the name
+
 # part 2
 def parse_grid(paper_grid: str):
     return [list(line) for line in paper_grid.strip().splitlines()]            # grid to strings
@@ -39,27 +47,198 @@ def neighbors(x, y, w, h):       # Say hi again
                 yield nx, ny
 
 def accessible_count(grid, roll='@', threshold=4):     # count accessible positions, create variables to remove
+    total_removed, _ = peel_rolls(grid, roll, threshold)
+    return total_removed
+
+def peel_rolls(grid, roll='@', threshold=4):
+    """Remove rolls round by round, only revisiting neighbours of what was just removed.
+
+    Returns (total_removed, removed_per_round).
+    """
     h = len(grid)
     w = len(grid[0]) if h else 0
-    grid = [row[:] for row in grid]    # create copy of grid
-    total_removed = 0
-    while True:                       # while loop to keep removing
-        to_remove = []
-        for y in range(h):
-            for x in range(w):
-                if grid[y][x] != roll:
-                    continue
-                n = sum(1 for nx, ny in neighbors(x, y, w, h) if grid[ny][nx] == roll)
-                if n < threshold:
-                    to_remove.append((x, y))
-        if not to_remove:
-            break
-        for x, y in to_remove:
-            grid[y][x] = '.'
-        total_removed += len(to_remove)
-    return total_removed
+    if not w:
+        return 0, []
+    W = w + 2                          # pad with a dead border so neighbours never need bounds checks
+    size = (h + 2) * W
+    is_roll = bytes(int(i == ord(roll)) for i in range(256))
+    alive = bytearray(size)
+    for y, row in enumerate(grid):
+        start = (y + 1) * W + 1
+        alive[start:start + w] = ''.join(row).encode('latin-1').translate(is_roll)
+    offsets = (-W - 1, -W, -W + 1, -1, 1, W - 1, W, W + 1)
+
+    # neighbour counts for every cell at once: one byte per cell, so adding the 8
+    # shifted copies of the grid as big ints never carries (counts top out at 8)
+    cells = int.from_bytes(alive, 'little')
+    summed = 0
+    for o in offsets:
+        summed += cells >> (8 * o) if o > 0 else cells << (-8 * o)
+    counts = bytearray((summed & ((1 << (8 * size)) - 1)).to_bytes(size, 'little'))
+
+    below = bytes(int(i < threshold) for i in range(256))
+    first = int.from_bytes(counts.translate(below), 'little') & cells
+    current = [m.start() for m in re.finditer(b'\x01', first.to_bytes(size, 'little'))]
+    removed_per_round = []
+    while current:
+        for i in current:
+            alive[i] = 0
+        removed_per_round.append(len(current))
+        nxt = []
+        for i in current:              # only the 8 neighbours of removed rolls can change
+            for o in offsets:
+                j = i + o
+                if alive[j]:
+                    c = counts[j] - 1
+                    counts[j] = c
+                    if c == threshold - 1:   # just dropped below, goes in the next round
+                        nxt.append(j)
+        current = nxt
+    return sum(removed_per_round), removed_per_round
     
+# numpy backend
+def grid_to_array(grid, roll='@'):
+    h = len(grid)
+    w = len(grid[0]) if h else 0
+    raw = ''.join(''.join(row) for row in grid).encode('latin-1')
+    return np.frombuffer(raw, dtype=np.uint8).reshape(h, w) == ord(roll)
+
+def neighbor_counts_np(mask):
+    """Neighbour counts for every cell from 8 shifted slices of the zero-padded grid."""
+    padded = np.pad(mask, 1).astype(np.uint8)
+    h, w = mask.shape
+    counts = np.zeros((h, w), dtype=np.uint8)
+    for dy in (0, 1, 2):
+        for dx in (0, 1, 2):
+            if dy == 1 and dx == 1:
+                continue
+            counts += padded[dy:dy + h, dx:dx + w]
+    return counts
+
+def accessible_count_np(grid, roll='@', threshold=4):
+    mask = grid_to_array(grid, roll)
+    return int(np.count_nonzero(mask & (neighbor_counts_np(mask) < threshold)))
+
+def peel_rolls_np(grid, roll='@', threshold=4):
+    mask = grid_to_array(grid, roll)
+    counts = neighbor_counts_np(mask)
+    removed_per_round = []
+    while True:
+        remove = mask & (counts < threshold)
+        n = int(np.count_nonzero(remove))
+        if not n:
+            break
+        mask &= ~remove
+        counts -= neighbor_counts_np(remove)    # removed rolls no longer count for their neighbours
+        removed_per_round.append(n)
+    return sum(removed_per_round), removed_per_round
+
+def count_rolls(grid, part=2, roll='@', threshold=4, use_numpy=False):
+    if use_numpy:
+        if np is None:
+            raise RuntimeError("numpy backend requested but numpy is not installed")
+        if part == 1:
+            return accessible_count_np(grid, roll, threshold)
+        return peel_rolls_np(grid, roll, threshold)[0]
+    if part == 1:
+        return count_accessible_once(grid, roll)
+    return accessible_count(grid, roll, threshold)
+
+# bit-packed backend
+class BitGrid:
+    """Grid with each row packed into an int, bit x set where column x holds a roll."""
+
+    __slots__ = ("rows", "width", "height")
+
+    def __init__(self, rows, width):
+        self.rows = rows
+        self.width = width
+        self.height = len(rows)
+
+    @classmethod
+    def from_text(cls, paper_grid: str, roll='@'):
+        to_bits = bytes(ord('1') if i == ord(roll) else ord('0') for i in range(256))
+        lines = paper_grid.strip().splitlines()
+        width = max((len(line) for line in lines), default=0)
+        # reverse each row so column 0 lands on bit 0
+        rows = [int(line.encode('latin-1').translate(to_bits)[::-1] or b'0', 2) for line in lines]
+        return cls(rows, width)
+
+    @classmethod
+    def from_grid(cls, grid, roll='@'):
+        return cls.from_text('\n'.join(''.join(row) for row in grid), roll)
+
+    def _row(self, y):
+        return self.rows[y] if 0 <= y < self.height else 0
+
+    def _removable(self, y, threshold):
+        """Rolls in row y with fewer than `threshold` neighbours, as a row mask."""
+        row = self.rows[y]
+        if not row:
+            return 0
+        full = (1 << self.width) - 1
+        above, below = self._row(y - 1), self._row(y + 1)
+        # add the 8 neighbour masks into 4 bit-planes (a counter per column, counts go up to 8)
+        planes = [0, 0, 0, 0]
+        for v in (above << 1, above, above >> 1, row << 1, row >> 1, below << 1, below, below >> 1):
+            carry = v & full
+            for k in range(4):
+                planes[k], carry = planes[k] ^ carry, planes[k] & carry
+                if not carry:
+                    break
+        # compare each column's count against threshold, most significant plane first
+        below_t, equal = 0, full
+        for k in (3, 2, 1, 0):
+            if (threshold >> k) & 1:
+                below_t |= equal & ~planes[k]
+                equal &= planes[k]
+            else:
+                equal &= ~planes[k]
+        if threshold >= 16:
+            below_t = full
+        return row & below_t
+
+    def accessible_count(self, threshold=4):
+        return sum(self._removable(y, threshold).bit_count() for y in range(self.height))
+
+    def peel(self, threshold=4):
+        """Part 2 on packed rows; only rows next to last round's removals are recomputed."""
+        rows = self.rows[:]
+        grid = BitGrid(rows, self.width)
+        dirty = range(self.height)
+        removed_per_round = []
+        while True:
+            removals = {}
+            for y in dirty:
+                mask = grid._removable(y, threshold)
+                if mask:
+                    removals[y] = mask
+            if not removals:
+                break
+            for y, mask in removals.items():
+                rows[y] &= ~mask
+            removed_per_round.append(sum(mask.bit_count() for mask in removals.values()))
+            dirty = sorted({ny for y in removals for ny in (y - 1, y, y + 1) if 0 <= ny < self.height})
+        return sum(removed_per_round), removed_per_round
+
+def main(path="day_4_input.txt", part=2, use_numpy=False, packed=False):
+    with open(path, 'r') as f:
+        text = f.read()
+    if packed:
+        grid = BitGrid.from_text(text)
+        print(grid.accessible_count() if part == 1 else grid.peel()[0])
+        return
+    grid = parse_grid(text)
+    print(count_rolls(grid, part, use_numpy=use_numpy))
+
 if __name__ == "__main__":
-    
-    grid = parse_grid(paper_grid)
-    print(accessible_count(grid))
\ No newline at end of file
+    import sys
+    flags = {"--numpy", "--packed"}
+    args = [a for a in sys.argv[1:] if a not in flags]
+    part = 2
+    path = "day_4_input.txt"
+    if args and args[0] in ["1", "2"]:
+        part = int(args.pop(0))
+    if args:
+        path = args[0]
+    main(path, part, use_numpy="--numpy" in sys.argv[1:], packed="--packed" in sys.argv[1:])
@@ -1,3 +1,10 @@
+from array import array
+from bisect import bisect_right
+from itertools import islice
+from time import perf_counter
+from typing import Iterable, Iterator, TextIO
+
+
 def parse_allowed_ranges(allowed_ranges: str) -> list[tuple[int, int]]:
     ranges = []
     for line in allowed_ranges.strip().splitlines():
@@ -8,16 +15,90 @@ def parse_allowed_ranges(allowed_ranges: str) -> list[tuple[int, int]]:
 def parse_available_ingredients(available_ingredients: str) -> list[int]:
     return [int(line) for line in available_ingredients.strip().splitlines()]
 
+def iter_lines(fh: TextIO, chunk_size: int = 1 << 16) -> Iterator[str]:
+    """Yield lines from a file handle, reading it in fixed-size chunks."""
+    tail = ''
+    while True:
+        chunk = fh.read(chunk_size)
+        if not chunk:
+            break
+        lines = (tail + chunk).split('\n')
+        tail = lines.pop()     # last piece may be a partial line, carry it into the next chunk
+        yield from lines
+    if tail:
+        yield tail
+
+def iter_allowed_ranges(lines: Iterator[str]) -> Iterator[tuple[int, int]]:
+    """Yield ranges up to the blank line that separates them from the ingredient IDs."""
+    seen_any = False
+    for line in lines:
+        line = line.strip()
+        if not line:
+            if seen_any:
+                return
+            continue
+        start, end = line.split('-')
+        seen_any = True
+        yield int(start), int(end)
+
+def iter_available_ingredients(lines: Iterator[str]) -> Iterator[int]:
+    for line in lines:
+        line = line.strip()
+        if line:
+            yield int(line)
+
+def merge_ranges(allowed_ranges: Iterable[tuple[int, int]]) -> list[tuple[int, int]]:
+    """Sort ranges and fold overlapping or touching ones together."""
+    merged = []
+    for s, e in sorted(allowed_ranges):
+        if merged and s <= merged[-1][1] + 1:
+            if e > merged[-1][1]:
+                merged[-1] = (merged[-1][0], e)
+        else:
+            merged.append((s, e))
+    return merged
+
+
+class IntervalIndex:
+    """Merged, sorted ranges stored as two int64 columns for bisect lookups."""
+
+    __slots__ = ("starts", "ends")
+
+    def __init__(self, allowed_ranges: Iterable[tuple[int, int]]):
+        merged = merge_ranges(allowed_ranges)
+        self.starts = array('q', (s for s, _ in merged))
+        self.ends = array('q', (e for _, e in merged))
+
+    def __len__(self) -> int:
+        return len(self.starts)
+
+    def __contains__(self, ingredient: int) -> bool:
+        # last range starting at or before the ingredient is the only one that can hold it
+        i = bisect_right(self.starts, ingredient) - 1
+        return i >= 0 and ingredient <= self.ends[i]
+
+    def count_fresh(self, available_ingredients: Iterable[int]) -> int:
+        """Bulk membership: sort the batch once and sweep it alongside the ranges."""
+        starts, ends = self.starts, self.ends
+        n = len(starts)
+        i = 0
+        fresh = 0
+        for ingredient in sorted(available_ingredients):
+            while i < n and ends[i] < ingredient:
+                i += 1
+            if i == n:
+                break
+            if starts[i] <= ingredient:
+                fresh += 1
+        return fresh
+
+    def total_ids(self) -> int:
+        return sum(e - s + 1 for s, e in zip(self.starts, self.ends))
+
 # Part 1: sum the bad stuff
 
-# def ingredients_sum(allowed_ranges: list[tuple[int, int]], available_ingredients: list[int]) -> list[int]:
-#     ingredients_sum = 0
-#     for ingredient in available_ingredients:
-#         for start, end in allowed_ranges:
-#             if start <= ingredient <= end:
-#                 ingredients_sum += 1
-#                 break
-#     return ingredients_sum
+def ingredients_sum(allowed_ranges: list[tuple[int, int]], available_ingredients: list[int]) -> int:
+    return IntervalIndex(allowed_ranges).count_fresh(available_ingredients)
 
 # part 1
 # if __name__ == "__main__":
@@ -32,19 +113,38 @@ def parse_available_ingredients(available_ingredients: str) -> list[int]:
 def count_fresh_ids_from_ranges(allowed_ranges: list[tuple[int, int]]) -> int:
     if not allowed_ranges:
         return 0
-    ranges = sorted(allowed_ranges)
-    total = 0
-    current_start, current_end = ranges[0]
-    for s, e in ranges[1:]:
-        if s <= current_end + 1:
-            current_end = max(current_end, e)
-        else:
-            total += current_end - current_start + 1
-            current_start, current_end = s, e
-    total += current_end - current_start + 1
-    return total
+    return IntervalIndex(allowed_ranges).total_ids()
+
+def count_fresh_streaming(fh: TextIO, chunk_size: int = 1 << 16, batch_size: int = 1 << 16) -> tuple[int, int, int]:
+    """Both parts straight from a file handle: (fresh ingredients, fresh IDs, lines read).
+
+    Only the ranges and one batch of ingredient IDs are held in memory at a time.
+    """
+    line_count = 0
+
+    def counted(lines):
+        nonlocal line_count
+        for line in lines:
+            line_count += 1
+            yield line
+
+    lines = counted(iter_lines(fh, chunk_size))
+    index = IntervalIndex(iter_allowed_ranges(lines))
+    ingredients = iter_available_ingredients(lines)
+    fresh = 0
+    while batch := list(islice(ingredients, batch_size)):
+        fresh += index.count_fresh(batch)
+    return fresh, index.total_ids(), line_count
+
+def main(path: str = "day_5_input.txt", chunk_size: int = 1 << 16) -> None:
+    start = perf_counter()
+    with open(path, 'r') as fh:
+        fresh, fresh_ids, line_count = count_fresh_streaming(fh, chunk_size)
+    elapsed = perf_counter() - start
+    print(f"Number of available ingredients within allowed ranges: {fresh}")
+    print(f"Sum of available ingredients within allowed ranges: {fresh_ids}")
+    print(f"Read {line_count} lines in {elapsed:.3f}s ({line_count / elapsed if elapsed else 0:,.0f} lines/sec)")
 
 if __name__ == "__main__":
-    allowed_ranges_list = parse_allowed_ranges(allowed_ranges)
-    result = count_fresh_ids_from_ranges(allowed_ranges_list)
-    print(f"Sum of available ingredients within allowed ranges: {result}")
\ No newline at end of file
+    import sys
+    main(*sys.argv[1:2])
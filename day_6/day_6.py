@@ -1,132 +1,238 @@
+import mmap
+import re
+from array import array
+from functools import lru_cache
 from pathlib import Path
-from typing import List
+from typing import Iterable, Iterator, List, Sequence, Tuple
 
 
-def parse_worksheet_part2(lines: List[str]) -> int:
-    """Part 2: Read right-to-left, each column is a number (top=MSD, bottom=LSD)."""
-    width = max(len(l) for l in lines)
-    grid = [list(l.rstrip("\n").ljust(width)) for l in lines]
-    h = len(grid)
-    ops_row = grid[-1]
-    
-    # Identify problems: groups of columns separated by space-only columns
-    problems = []
-    x = 0
-    while x < width:
-        # Skip space-only columns (separator)
-        if all(grid[r][x] == ' ' for r in range(h)):
-            x += 1
-            continue
-        
-        # Found start of problem block
-        start = x
-        op = None
-        while x < width and not all(grid[r][x] == ' ' for r in range(h)):
-            if ops_row[x] in '+*':
-                op = ops_row[x]
-            x += 1
-        end = x
-        
-        if op:
-            problems.append((start, end, op))
-    
-    # Process each problem RIGHT-TO-LEFT
+@lru_cache(maxsize=8)     # rows mostly share a length; don't pin one big int per width
+def _spaces(n: int) -> int:
+    return int.from_bytes(b' ' * n, 'little')
+
+
+def separator_map(rows: Sequence[bytes]) -> bytes:
+    """One byte per column, zero where every row has a space (or nothing) in that column.
+
+    Each row is read as a little-endian int and XOR'd with a row of spaces, so
+    non-space characters become non-zero bytes; OR-ing all rows together marks
+    every column that holds something in a single pass.
+    """
+    width = max((len(row) for row in rows), default=0)
+    occupied = 0
+    for row in rows:
+        occupied |= int.from_bytes(row, 'little') ^ _spaces(len(row))
+    return occupied.to_bytes(width, 'little')
+
+
+def iter_blocks(rows: Sequence[bytes]) -> Iterator[Tuple[int, int, str]]:
+    """Yield (start, end, op) for each problem block, left to right."""
+    ops_row = rows[-1]
+    for match in re.finditer(rb'[^\x00]+', separator_map(rows)):
+        start, end = match.span()
+        ops = bytes(ops_row[start:end])
+        # last operator in the block wins, same as scanning it left to right
+        i = max(ops.rfind(b'+'), ops.rfind(b'*'))
+        if i >= 0:
+            yield start, end, chr(ops[i])
+
+
+def index_worksheet(lines: List[str]) -> Tuple[List[bytes], List[Tuple[int, int, str]]]:
+    """Encode the worksheet once and find its problem blocks; both parts reuse the result."""
+    rows = [l.rstrip("\n").encode() for l in lines]
+    return rows, list(iter_blocks(rows))
+
+
+def product_tree(numbers: List[int]) -> int:
+    """Multiply in a balanced tree so big-int products stay similar in size."""
+    if not numbers:
+        return 1
+    layer = list(numbers)
+    while len(layer) > 1:
+        paired = [layer[i] * layer[i + 1] for i in range(0, len(layer) - 1, 2)]
+        if len(layer) % 2:
+            paired.append(layer[-1])
+        layer = paired
+    return layer[0]
+
+
+def apply_op(op: str, numbers: List[int]) -> int:
+    if op == '+':
+        return sum(numbers)
+    return product_tree(numbers)
+
+
+def block_segments(rows: Sequence[bytes], start: int, end: int) -> List[bytes]:
+    """The block's slice of every row except the operator row."""
+    return [bytes(rows[r][start:end]) for r in range(len(rows) - 1)]
+
+
+def block_numbers_part1(segments: List[bytes]) -> List[int]:
+    """Part 1: each row segment inside a block is one number."""
+    numbers = []
+    for row_segment in segments:
+        row_segment = row_segment.strip()
+        if row_segment and row_segment.replace(b' ', b'').isdigit():
+            numbers.append(int(row_segment.replace(b' ', b'')))
+    return numbers
+
+
+def block_numbers_part2(segments: List[bytes]) -> List[int]:
+    """Part 2: each column inside a block is one number, read top (MSD) to bottom (LSD)."""
+    width = max((len(seg) for seg in segments), default=0)
+    numbers = []
+    for column in zip(*(seg.ljust(width) for seg in segments)):
+        digits = bytes(c for c in column if 48 <= c <= 57)
+        if digits:
+            numbers.append(int(digits))
+    return numbers
+
+
+_BLOCK_NUMBERS = {1: block_numbers_part1, 2: block_numbers_part2}
+
+
+def _evaluate_chunk(part: int, chunk: List[Tuple[str, List[bytes]]]) -> int:
+    block_numbers = _BLOCK_NUMBERS[part]
     total = 0
-    for start, end, op in reversed(problems):
-        # Within this problem block, each column represents one number
-        # Read top-to-bottom to get digits (MSD first)
-        numbers = []
-        
-        for col in range(start, end):
-            # Read this column top-to-bottom, collecting digits
-            digits = []
-            for r in range(h - 1):  # Skip operator row
-                c = grid[r][col]
-                if c.isdigit():
-                    digits.append(c)
-            
-            # If we collected digits, form a number
-            if digits:
-                numbers.append(int(''.join(digits)))
-        
-        # Apply operation to all numbers in this problem
+    for op, segments in chunk:
+        numbers = block_numbers(segments)
         if numbers:
-            if op == '+':
-                result = sum(numbers)
-            else:
-                result = 1
-                for n in numbers:
-                    result *= n
-            total += result
-    
+            total += apply_op(op, numbers)
     return total
 
 
-def parse_worksheet(lines: List[str]) -> int:
-    """Part 1: Read left-to-right, each problem is vertical numbers."""
-    width = max(len(l) for l in lines)
-    grid = [list(l.rstrip("\n").ljust(width)) for l in lines]
-    h = len(grid)
-    ops_row = grid[-1]
-
-    # Find problems separated by space-only columns
-    problems = []
-    x = 0
-    while x < width:
-        if all(grid[r][x] == ' ' for r in range(h)):
-            x += 1
-            continue
-        
-        start = x
-        op = None
-        while x < width and not all(grid[r][x] == ' ' for r in range(h)):
-            if ops_row[x] in '+*':
-                op = ops_row[x]
-            x += 1
-        end = x
-        
-        if op:
-            problems.append((start, end, op))
-    
+def evaluate(rows: Sequence[bytes], blocks: Iterable[Tuple[int, int, str]], part: int) -> int:
+    return _evaluate_chunk(part, ((op, block_segments(rows, start, end)) for start, end, op in blocks))
+
+
+def evaluate_part1(rows: Sequence[bytes], blocks: Iterable[Tuple[int, int, str]]) -> int:
+    return evaluate(rows, blocks, 1)
+
+
+def evaluate_part2(rows: Sequence[bytes], blocks: Iterable[Tuple[int, int, str]]) -> int:
+    return evaluate(rows, blocks, 2)
+
+
+def evaluate_parallel(rows: Sequence[bytes], blocks: Iterable[Tuple[int, int, str]], part: int,
+                      workers: int, chunk_size: int = 256) -> int:
+    """Evaluate blocks on a process pool; each worker gets chunks of (op, row segments).
+
+    At most 2 * workers chunks are in flight, so the parent never holds more than
+    that many blocks' segments at once.
+    """
+    from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+    from itertools import islice
+
+    blocks = iter(blocks)
     total = 0
-    for start, end, op in problems:
-        numbers = []
-        for r in range(h - 1):
-            row_segment = ''.join(grid[r][start:end]).strip()
-            if row_segment and row_segment.replace(' ', '').isdigit():
-                num_str = row_segment.replace(' ', '')
-                if num_str:
-                    numbers.append(int(num_str))
-        
-        if numbers:
-            if op == '+':
-                result = sum(numbers)
-            else:
-                result = 1
-                for n in numbers:
-                    result *= n
-            total += result
-    
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        pending = set()
+        while True:
+            chunk = [(op, block_segments(rows, start, end)) for start, end, op in islice(blocks, chunk_size)]
+            if chunk:
+                pending.add(pool.submit(_evaluate_chunk, part, chunk))
+            if pending and (not chunk or len(pending) >= 2 * workers):
+                done, pending = wait(pending, return_when=FIRST_COMPLETED)
+                total += sum(f.result() for f in done)
+            if not chunk and not pending:
+                break
     return total
-def main(path: str = "day_6.txt", part: int = 2) -> None:
-    text = Path(path).read_text()
-    lines = [ln for ln in text.splitlines() if ln.rstrip()]
-    
-    if part == 1:
-        total = parse_worksheet(lines)
+
+
+def parse_worksheet_part2(lines: List[str]) -> int:
+    """Part 2: Read right-to-left, each column is a number (top=MSD, bottom=LSD)."""
+    return evaluate_part2(*index_worksheet(lines))
+
+
+def parse_worksheet(lines: List[str]) -> int:
+    """Part 1: Read left-to-right, each problem is vertical numbers."""
+    return evaluate_part1(*index_worksheet(lines))
+
+
+def solve_worksheet(lines: List[str]) -> Tuple[int, int]:
+    """Both parts from a single tokenizer pass."""
+    rows, blocks = index_worksheet(lines)
+    return evaluate_part1(rows, blocks), evaluate_part2(rows, blocks)
+
+
+class MappedWorksheet:
+    """Worksheet rows served straight from a memory-mapped file.
+
+    Only the line offsets are indexed up front; indexing returns a zero-copy
+    memoryview of that row, so the tokenizer and evaluators above can read
+    columns without the whole grid ever being materialized.
+    """
+
+    _NON_SPACE = re.compile(rb'\S')
+
+    def __init__(self, path: str):
+        self._file = open(path, 'rb')
+        self._map = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ)
+        self._view = memoryview(self._map)
+        self.starts = array('q')
+        self.ends = array('q')
+        pos, size = 0, len(self._map)
+        while pos < size:
+            nl = self._map.find(b'\n', pos)
+            end = size if nl == -1 else nl
+            line_end = end - 1 if end > pos and self._map[end - 1] == 13 else end    # drop '\r'
+            if self._NON_SPACE.search(self._map, pos, line_end):    # skip blank lines like main does
+                self.starts.append(pos)
+                self.ends.append(line_end)
+            pos = end + 1
+
+    def __len__(self) -> int:
+        return len(self.starts)
+
+    def __getitem__(self, r: int) -> memoryview:
+        return self._view[self.starts[r]:self.ends[r]]
+
+    def close(self) -> None:
+        self._view.release()
+        self._map.close()
+        self._file.close()
+
+    def __enter__(self) -> "MappedWorksheet":
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.close()
+
+
+def _evaluate_all(rows: Sequence[bytes], blocks: Iterable[Tuple[int, int, str]], part: int, workers: int) -> int:
+    if workers > 1:
+        return evaluate_parallel(rows, blocks, part, workers)
+    return evaluate(rows, blocks, part)
+
+
+def main(path: str = "day_6.txt", part: int = 2, use_mmap: bool = False, workers: int = 1) -> None:
+    if use_mmap:
+        with MappedWorksheet(path) as rows:
+            # stream the blocks; a list of millions of tuples would dwarf the mapped file
+            total = _evaluate_all(rows, iter_blocks(rows), part, workers)
     else:
-        total = parse_worksheet_part2(lines)
-    
+        text = Path(path).read_text()
+        lines = [ln for ln in text.splitlines() if ln.rstrip()]
+        rows, blocks = index_worksheet(lines)
+        total = _evaluate_all(rows, blocks, part, workers)
     print(total)
+
+
 if __name__ == "__main__":
     import sys
+    use_mmap = "--mmap" in sys.argv[1:]
+    workers = 1
+    for a in sys.argv[1:]:
+        if a.startswith("--workers="):
+            workers = int(a.split("=", 1)[1])
+    args = [a for a in sys.argv[1:] if not a.startswith("--")]
     part = 2
     path = "day_6.txt"
-    if len(sys.argv) > 1:
-        if sys.argv[1] in ["1", "2"]:
-            part = int(sys.argv[1])
-            if len(sys.argv) > 2:
-                path = sys.argv[2]
+    if len(args) > 0:
+        if args[0] in ["1", "2"]:
+            part = int(args[0])
+            if len(args) > 1:
+                path = args[1]
         else:
-            path = sys.argv[1]
-    main(path, part)
\ No newline at end of file
+            path = args[0]
+    main(path, part, use_mmap, workers)
\ No newline at end of file
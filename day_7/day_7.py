@@ -10,41 +10,81 @@ S = start
 when contacting a spliter, beam splits into immediate left and right of splitter exclusive. if a beam falls between two splitters, it is only the one beam.
 """
 
-from typing import List
+from typing import Callable, Dict, List, TextIO, Tuple
 
-def main(path: str = "day_7_input.txt") -> int:
-    with open(path, 'r') as f:
-        lines = [line.rstrip('\n') for line in f]
 
-    height = len(lines)
-    width = max(len(l) for l in lines)
-    grid = [list(l.ljust(width)) for l in lines]
+def step_beams(beams: Dict[int, int], row: str, width: int) -> Tuple[Dict[int, int], int]:
+    """Move every active beam down one row.
+
+    beams maps column -> number of timelines on that column; only columns that
+    actually carry a beam are stored. Returns the next row's beams and how many
+    active columns hit a splitter.
+    """
+    next_beams: Dict[int, int] = {}
+    splits = 0
+    for col, count in beams.items():
+        cell = row[col] if col < len(row) else ' '
+        if cell == '.':
+            next_beams[col] = next_beams.get(col, 0) + count
+        elif cell == '^':
+            # Split left and right, if within bounds
+            if col - 1 >= 0:
+                next_beams[col - 1] = next_beams.get(col - 1, 0) + count
+            if col + 1 < width:
+                next_beams[col + 1] = next_beams.get(col + 1, 0) + count
+            splits += 1
+        # If cell is ' ', beam is lost (do nothing)
+    return next_beams, splits
+
 
-    # Find the start column in the first row
+def find_start(row: str) -> int:
     try:
-        start_col = grid[0].index('S')
+        return row.index('S')
     except ValueError:
         raise ValueError("No start position 'S' found in the top row.")
 
-    active_beams = {start_col}
+
+def propagate(lines: List[str]) -> Tuple[int, int]:
+    """One pass over the manifold: (total splits, total timelines at the bottom)."""
+    width = max(len(l) for l in lines)
+    beams = {find_start(lines[0]): 1}
     split_count = 0
+    for row in lines[1:]:
+        beams, splits = step_beams(beams, row, width)
+        split_count += splits
+    return split_count, sum(beams.values())
+
+
+def propagate_stream(f: TextIO, progress_every: int = 0, report: Callable[[str], None] = print) -> Tuple[int, int]:
+    """Same as propagate, but reads one row at a time so memory stays O(width).
+
+    Rows are not padded up front, so the right edge is the widest row seen so
+    far; this only differs from propagate on ragged input whose widest row
+    comes after a beam reaches that edge. With progress_every > 0, reports
+    the running totals every that many rows.
+    """
+    first = f.readline().rstrip('\n')
+    width = len(first)
+    beams = {find_start(first): 1}
+    split_count = 0
+    for rows_read, line in enumerate(f, start=2):
+        row = line.rstrip('\n')
+        width = max(width, len(row))
+        beams, splits = step_beams(beams, row, width)
+        split_count += splits
+        if progress_every and rows_read % progress_every == 0:
+            report(f"row {rows_read}: {len(beams)} active beams, {split_count} splits, "
+                   f"{sum(beams.values())} timelines")
+    return split_count, sum(beams.values())
+
+
+def solve(path: str = "day_7_input.txt", progress_every: int = 0) -> Tuple[int, int]:
+    with open(path, 'r') as f:
+        return propagate_stream(f, progress_every)
 
-    for row in range(1, height):
-        next_beams = set()
-        for col in active_beams:
-            cell = grid[row][col]
-            if cell == '.':
-                next_beams.add(col)
-            elif cell == '^':
-                # Split left and right, if within bounds
-                if col - 1 >= 0:
-                    next_beams.add(col - 1)
-                if col + 1 < width:
-                    next_beams.add(col + 1)
-                split_count += 1
-            # If cell is ' ', beam is lost (do nothing)
-        active_beams = next_beams
 
+def main(path: str = "day_7_input.txt", progress_every: int = 0) -> int:
+    split_count, _ = solve(path, progress_every)
     print("Total splits:", split_count)
     return split_count
     
@@ -1,42 +1,83 @@
-from typing import List
+from typing import Iterable, List
 
-def main(path: str = "./day_7/day_7_input.txt") -> int:
+from day_7 import find_start, propagate, solve
+
+try:
+    import numpy as np
+except ImportError:      # numpy backend is optional
+    np = None
+
+def count_timelines_numpy(lines: Iterable[str]) -> int:
+    """Vectorized part 2: one array op per row instead of a Python loop per column.
+
+    Counts start as int64 and switch to object dtype (Python ints) before a row
+    could overflow; a column can at most triple in one row (itself plus both
+    neighbouring splitters). The final total is summed as Python ints, since
+    the columns together can pass int64 even when none of them does.
+    """
+    lines = iter(lines)
+    first = next(lines).rstrip('\n')
+    counts = np.zeros(len(first), dtype=np.int64)
+    counts[find_start(first)] = 1
+    limit = np.iinfo(np.int64).max // 3
+    for line in lines:
+        row = line.rstrip('\n')
+        if len(row) > len(counts):
+            counts = np.concatenate([counts, np.zeros(len(row) - len(counts), dtype=counts.dtype)])
+        if counts.dtype != object and counts.max() > limit:
+            counts = counts.astype(object)
+        cells = np.frombuffer(row.encode('latin-1').ljust(len(counts)), dtype=np.uint8)
+        hits = np.where(cells == ord('^'), counts, 0)
+        counts = np.where(cells == ord('.'), counts, 0)   # ' ' (and anything else) drops the beam
+        counts[:-1] += hits[1:]     # splitter sends its timelines left...
+        counts[1:] += hits[:-1]     # ...and right, anything past the edge is lost
+    return sum(counts.tolist())
+
+def galton_board(width: int = 301, rows: int = 126) -> List[str]:
+    """S in the middle, then alternating all-splitter and empty rows.
+
+    The default size just passes int64 in the total while every column stays
+    below it, which is the case the numpy path has to sum carefully.
+    """
+    half = width // 2
+    lines = ['.' * half + 'S' + '.' * (width - half - 1)]
+    lines += ['^' * width if r % 2 == 0 else '.' * width for r in range(rows - 1)]
+    return lines
+
+def check_backends(path: str = "./day_7/day_7_input.txt") -> int:
+    """Run the pure-Python and numpy paths on the same file and make sure they agree.
+
+    The Galton board from galton_board is checked as well, for the overflow edge.
+    """
+    board = galton_board()
+    _, expected = propagate(board)
+    got = count_timelines_numpy(board)
+    if got != expected:
+        raise AssertionError(f"numpy backend gave {got} on the Galton board, pure Python gave {expected}")
+    _, expected = solve(path)
     with open(path, 'r') as f:
-        lines = [line.rstrip('\n') for line in f]
-
-    height = len(lines)
-    width = max(len(l) for l in lines)
-    grid = [list(l.ljust(width)) for l in lines]
-
-    # Find the start column in first row
-    try:
-        start_col = grid[0].index('S')
-    except ValueError:
-        raise ValueError("No start position 'S' found in the top row.")
-
-    # timeline_counts[row][col] = number of timelines at (row, col)
-    timeline_counts = [ [0]*width for _ in range(height) ]
-    timeline_counts[0][start_col] = 1
-
-    for row in range(1, height):
-        for col in range(width):
-            count = timeline_counts[row-1][col]
-            if count == 0:
-                continue
-            cell = grid[row][col]
-            if cell == '.':
-                timeline_counts[row][col] += count
-            elif cell == '^':
-                if col - 1 >= 0:
-                    timeline_counts[row][col-1] += count
-                if col + 1 < width:
-                    timeline_counts[row][col+1] += count
-            # if cell is ' ', beam is lost (do nothing)
-
-    total_timelines = sum(timeline_counts[-1])
+        got = count_timelines_numpy(f)
+    if got != expected:
+        raise AssertionError(f"numpy backend gave {got}, pure Python gave {expected}")
+    return got
+
+def main(path: str = "./day_7/day_7_input.txt", progress_every: int = 0, use_numpy: bool = False) -> int:
+    if use_numpy:
+        if np is None:
+            raise RuntimeError("numpy backend requested but numpy is not installed")
+        with open(path, 'r') as f:
+            total_timelines = count_timelines_numpy(f)
+    else:
+        # day_7 streams the file row by row and keeps only the active columns,
+        # and gives the part 1 split count from the same pass
+        _, total_timelines = solve(path, progress_every)
     print("Total timelines at bottom:", total_timelines)
     return total_timelines
 
 if __name__ == "__main__":
-    main()
-
+    import sys
+    args = [a for a in sys.argv[1:] if not a.startswith("--")]
+    if "--check" in sys.argv[1:]:
+        print("Backends agree:", check_backends(*args[:1]))
+    else:
+        main(*args[:1], use_numpy="--numpy" in sys.argv[1:])
@@ -0,0 +1,73 @@
+"""Microbenchmark: DisjointSet against the find/union closures day_8 used to inline.
+
+Usage: python bench_disjoint_set.py [unions] [elements]
+"""
+import random
+import sys
+from array import array
+from time import perf_counter
+
+from disjoint_set import DisjointSet
+
+
+def closure_unions(n: int, left: array, right: array) -> int:
+    # the copy-pasted closures from the old day_8.py / day_8_pt2.py
+    parent = list(range(n))
+    size = [1] * n
+
+    def find(a):
+        while parent[a] != a:
+            parent[a] = parent[parent[a]]
+            a = parent[a]
+        return a
+
+    def union(a, b):
+        ra, rb = find(a), find(b)
+        if ra == rb:
+            return False
+        if size[ra] < size[rb]:
+            ra, rb = rb, ra
+        parent[rb] = ra
+        size[ra] += size[rb]
+        return True
+
+    merged = 0
+    for a, b in zip(left, right):
+        if union(a, b):
+            merged += 1
+    return merged
+
+
+def method_unions(n: int, left: array, right: array) -> int:
+    groups = DisjointSet(n)
+    union = groups.union
+    merged = 0
+    for a, b in zip(left, right):
+        if union(a, b):
+            merged += 1
+    return merged
+
+
+def batch_unions(n: int, left: array, right: array) -> int:
+    return DisjointSet(n).union_many(zip(left, right))
+
+
+def main(unions: int = 10 ** 7, n: int = 10 ** 6) -> None:
+    rng = random.Random(8)
+    left = array('i', (rng.randrange(n) for _ in range(unions)))
+    right = array('i', (rng.randrange(n) for _ in range(unions)))
+    print(f"{unions} unions over {n} elements")
+    expected = None
+    for name, fn in (("closures", closure_unions), ("DisjointSet.union", method_unions),
+                     ("DisjointSet.union_many", batch_unions)):
+        start = perf_counter()
+        merged = fn(n, left, right)
+        elapsed = perf_counter() - start
+        if expected is None:
+            expected = merged
+        assert merged == expected, f"{name} merged {merged}, expected {expected}"
+        print(f"  {name:<24} {elapsed:7.2f}s  ({unions / elapsed:,.0f} unions/sec)")
+
+
+if __name__ == "__main__":
+    main(*map(int, sys.argv[1:3]))
@@ -1,68 +1,196 @@
-from typing import List
+from typing import Iterator, List, Tuple
 
-def main(path: str = "day_8/day_8_input.txt", k: int = 1000) -> int:
-    """Process 3D points from file and find product of sizes of three largest groups"""
-    from itertools import combinations
-    import heapq
-    from collections import Counter
-    from functools import reduce
-    from operator import mul
+from disjoint_set import DisjointSet
+
+try:
+    import numpy as np
+except ImportError:      # numpy kernel is optional
+    np = None
+
+Point = Tuple[int, int, int]
 
+
+def read_points(path: str) -> List[Point]:
     with open(path, 'r') as f:
-        points = [tuple(map(int, line.strip().split(','))) for line in f if line.strip()]
+        return [tuple(map(int, line.strip().split(','))) for line in f if line.strip()]
+
 
+def pair_dist_iter(points: List[Point]) -> Iterator[Tuple[int, int, int]]:
+    """Every pair (squared distance, i, j) with i < j, in index order."""
     n = len(points)
-    if n == 0:
-        return 0
+    for i in range(n):
+        xi, yi, zi = points[i]
+        for j in range(i + 1, n):
+            xj, yj, zj = points[j]
+            d = (xi - xj) ** 2 + (yi - yj) ** 2 + (zi - zj) ** 2
+            yield (d, i, j)
 
-    total_pairs = n * (n - 1) // 2
-    k = min(k, total_pairs)
 
-    # Generate pairwise squared distances lazily and pick k smallest efficiently.
-    def pair_dist_iter():
-        for i in range(n):
+def pairs_within(points: List[Point], limit: int) -> Iterator[Tuple[int, int, int]]:
+    """Every pair with squared distance <= limit, found through a uniform grid.
+
+    Cells are at least sqrt(limit) wide, so any close pair sits in the same or
+    an adjacent cell and only the 27 surrounding cells need checking.
+    """
+    from collections import defaultdict
+    from math import isqrt
+
+    cell = isqrt(limit) + 1
+    grid = defaultdict(list)
+    for idx, (x, y, z) in enumerate(points):
+        grid[(x // cell, y // cell, z // cell)].append(idx)
+
+    around = [(dx, dy, dz) for dx in (-1, 0, 1) for dy in (-1, 0, 1) for dz in (-1, 0, 1)]
+    for (cx, cy, cz), members in grid.items():
+        nearby = []
+        for dx, dy, dz in around:
+            nearby.extend(grid.get((cx + dx, cy + dy, cz + dz), ()))
+        for i in members:
             xi, yi, zi = points[i]
-            for j in range(i + 1, n):
+            for j in nearby:
+                if j <= i:
+                    continue
                 xj, yj, zj = points[j]
                 d = (xi - xj) ** 2 + (yi - yj) ** 2 + (zi - zj) ** 2
-                yield (d, i, j)
+                if d <= limit:
+                    yield (d, i, j)
+
+
+def nearest_neighbour_spacing(points: List[Point], samples: int = 32) -> float:
+    """Median nearest-neighbour distance over a spread of sampled points.
+
+    Unlike the bounding box, this doesn't care about a few far outliers.
+    """
+    n = len(points)
+    step = max(1, n // samples)
+    gaps = []
+    for s in range(0, n, step):
+        xs, ys, zs = points[s]
+        nearest = min((xs - x) ** 2 + (ys - y) ** 2 + (zs - z) ** 2
+                      for t, (x, y, z) in enumerate(points) if t != s)
+        gaps.append(nearest)
+    gaps.sort()
+    return gaps[len(gaps) // 2] ** 0.5
+
 
+def k_smallest_pairs(points: List[Point], k: int, budget: int = 8) -> List[Tuple[int, int, int]]:
+    """The k smallest pairs by (squared distance, i, j) without enumerating all pairs.
 
-    smallest = heapq.nsmallest(k, pair_dist_iter(), key=lambda x: x[0])
+    Grows a search radius until at least k pairs fall inside it; the k
+    smallest overall must then all be inside, ties included, so the result
+    matches heapq.nsmallest over pair_dist_iter exactly. Only the k best pairs
+    of a round are held. Once a round has yielded budget * k pairs, the radius
+    shrinks to the k-th best distance seen so far and the round starts again.
+    """
+    from heapq import heappush, heapreplace
+
+    n = len(points)
+    k = min(k, n * (n - 1) // 2)
+    if k <= 0:
+        return []
+
+    extents = [max(p[axis] for p in points) - min(p[axis] for p in points) for axis in range(3)]
+    diagonal = sum(e * e for e in extents)
+    # about n/2 * (r / spacing)^3 pairs fall within r of each other locally
+    radius = max(1.0, nearest_neighbour_spacing(points) * (2 * k / n) ** (1 / 3))
+    limit = int(radius * radius)
+    max_seen = budget * k
+
+    while True:
+        worst = []      # max-heap of the k best pairs so far, as negated (d, i, j)
+        seen = 0
+        for d, i, j in pairs_within(points, limit):
+            item = (-d, -i, -j)
+            if len(worst) < k:
+                heappush(worst, item)
+            elif item > worst[0]:
+                heapreplace(worst, item)
+            seen += 1
+            if seen > max_seen and -worst[0][0] < limit:
+                break
+        else:
+            if len(worst) >= k or limit >= diagonal:
+                break
+            grow = (k / len(worst)) ** (2 / 3) * 1.2 if worst else 4.0
+            limit = int(limit * min(4.0, max(1.2, grow))) + 1
+            continue
+        limit = -worst[0][0]    # k pairs are already known to sit this close
+
+    return sorted((-d, -i, -j) for d, i, j in worst)
+
+
+def k_smallest_pairs_numpy(points: List[Point], k: int, block: int = 1024) -> List[Tuple[int, int, int]]:
+    """Brute-force k smallest pairs, tile by tile, without an n x n matrix.
+
+    Each block x block tile of squared distances is filtered against the
+    running k-th smallest distance (from np.partition), keeping everything
+    tied with it so the final (d, i, j) sort matches heapq.nsmallest over
+    pair_dist_iter exactly.
+    """
+    n = len(points)
+    k = min(k, n * (n - 1) // 2)
+    if k <= 0:
+        return []
+    coords = np.asarray(points, dtype=np.int64)
+    best_d = np.empty(0, dtype=np.int64)
+    best_i = np.empty(0, dtype=np.int64)
+    best_j = np.empty(0, dtype=np.int64)
+    cutoff = None
+    for i0 in range(0, n, block):
+        a = coords[i0:i0 + block]
+        for j0 in range(i0, n, block):
+            b = coords[j0:j0 + block]
+            d = np.zeros((len(a), len(b)), dtype=np.int64)
+            for axis in range(3):
+                diff = a[:, axis, None] - b[None, :, axis]
+                d += diff * diff
+            keep = np.ones(d.shape, dtype=bool) if i0 != j0 else np.triu(np.ones(d.shape, dtype=bool), 1)
+            if cutoff is not None:
+                keep &= d <= cutoff
+            ti, tj = np.nonzero(keep)
+            best_d = np.concatenate([best_d, d[ti, tj]])
+            best_i = np.concatenate([best_i, ti + i0])
+            best_j = np.concatenate([best_j, tj + j0])
+            if len(best_d) > k:
+                cutoff = np.partition(best_d, k - 1)[k - 1]
+                survivors = best_d <= cutoff
+                best_d, best_i, best_j = best_d[survivors], best_i[survivors], best_j[survivors]
+    order = np.lexsort((best_j, best_i, best_d))[:k]
+    return list(zip(best_d[order].tolist(), best_i[order].tolist(), best_j[order].tolist()))
 
-    # Disjoint-set (union-find) with size
-    parent = list(range(n))
-    size = [1] * n
 
-    def find(a):
-        while parent[a] != a:
-            parent[a] = parent[parent[a]]
-            a = parent[a]
-        return a
+def main(path: str = "day_8/day_8_input.txt", k: int = 1000, backend: str = "grid") -> int:
+    """Process 3D points from file and find product of sizes of three largest groups"""
+    from functools import reduce
+    from operator import mul
+
+    points = read_points(path)
+
+    n = len(points)
+    if n == 0:
+        return 0
 
-    def union(a, b):
-        ra, rb = find(a), find(b)
-        if ra == rb:
-            return False
-        if size[ra] < size[rb]:
-            ra, rb = rb, ra
-        parent[rb] = ra
-        size[ra] += size[rb]
-        return True
+    # k smallest pairs come out of a spatial grid instead of scanning all n^2 pairs;
+    # the numpy tile kernel and the plain generator are there as brute-force oracles.
+    if backend == "numpy":
+        smallest = k_smallest_pairs_numpy(points, k)
+    elif backend == "brute":
+        import heapq
+        smallest = heapq.nsmallest(k, pair_dist_iter(points), key=lambda x: x[0])
+        smallest.sort(key=lambda x: x[0])
+    else:
+        smallest = k_smallest_pairs(points, k)
 
     # Process the k smallest pairs in ascending distance order.
-    smallest.sort(key=lambda x: x[0])
-    for _, i, j in smallest:
-        union(i, j)
+    groups = DisjointSet(n)
+    groups.union_many((i, j) for _, i, j in smallest)
 
     # Count component sizes
-    roots = [find(i) for i in range(n)]
-    counts = Counter(roots)
-    sizes = sorted(counts.values(), reverse=True)
+    sizes = groups.component_sizes()
 
     # Debug prints
     print(f"All group sizes (desc): {sizes}")
-    top3 = sizes[:3]
+    top3 = groups.top_sizes(3)
     print(f"Top 3 sizes: {top3}")
 
     if not top3:
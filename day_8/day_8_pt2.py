@@ -1,63 +1,279 @@
-from typing import List, Tuple
+from typing import List, Optional, Tuple
 
+from day_8 import nearest_neighbour_spacing, pairs_within
+from disjoint_set import DisjointSet
 
-def find_last_connection(points: List[Tuple[int, int, int]]) -> int:
+try:
+    import numpy as np
+except ImportError:      # numpy only speeds up the dense Prim variant
+    np = None
+
+Edge = Tuple[int, int, int]
+
+
+def prim_mst(points: List[Tuple[int, int, int]]) -> List[Edge]:
+    """Dense Prim's: O(n^2) time but only O(n) memory, no pair list.
+
+    Edges are compared as (squared distance, i, j) with i < j, the same total
+    order Kruskal sorts by, so both build the same tree even with ties.
+    """
+    n = len(points)
+    if np is not None:
+        return _prim_mst_numpy(points)
+    in_tree = bytearray(n)
+    best: List[Optional[Edge]] = [None] * n
+    edges = []
+    cur = 0
+    for _ in range(n - 1):
+        in_tree[cur] = 1
+        xc, yc, zc = points[cur]
+        nxt = None
+        for v in range(n):
+            if in_tree[v]:
+                continue
+            xv, yv, zv = points[v]
+            d = (xc - xv) ** 2 + (yc - yv) ** 2 + (zc - zv) ** 2
+            key = (d, cur, v) if cur < v else (d, v, cur)
+            if best[v] is None or key < best[v]:
+                best[v] = key
+            if nxt is None or best[v] < best[nxt]:
+                nxt = v
+        edges.append(best[nxt])
+        cur = nxt
+    return edges
+
+
+def _prim_mst_numpy(points: List[Tuple[int, int, int]]) -> List[Edge]:
     n = len(points)
-    if n < 2:
+    coords = np.array(points, dtype=np.int64)
+    idx = np.arange(n)
+    done = np.iinfo(np.int64).max
+    best_d = np.full(n, done, dtype=np.int64)
+    best_a = np.zeros(n, dtype=np.int64)
+    best_b = np.zeros(n, dtype=np.int64)
+    in_tree = np.zeros(n, dtype=bool)
+    edges = []
+    cur = 0
+    for _ in range(n - 1):
+        in_tree[cur] = True
+        best_d[cur] = done
+        diff = coords - coords[cur]
+        d = np.einsum('ij,ij->i', diff, diff)
+        a = np.minimum(idx, cur)
+        b = np.maximum(idx, cur)
+        better = ~in_tree & ((d < best_d) | ((d == best_d) & ((a < best_a) | ((a == best_a) & (b < best_b)))))
+        best_d[better] = d[better]
+        best_a[better] = a[better]
+        best_b[better] = b[better]
+        # closest vertex outside the tree, ties broken by (i, j) like Kruskal's sort
+        tied = np.flatnonzero(best_d == best_d.min())
+        nxt = int(tied[np.lexsort((best_b[tied], best_a[tied]))[0]])
+        edges.append((int(best_d[nxt]), int(best_a[nxt]), int(best_b[nxt])))
+        cur = nxt
+    return edges
+
+
+class KDTree:
+    """Static 3-d tree over point indices, stored as flat per-node lists.
+
+    Node t covers order[start[t]:end[t]]; leaves have left[t] == -1. Children
+    always come after their parent, so walking the nodes backwards is a
+    bottom-up pass.
+    """
+
+    def __init__(self, points: List[Tuple[int, int, int]], leaf_size: int = 16):
+        self.points = points
+        self.order = list(range(len(points)))
+        self.start: List[int] = []
+        self.end: List[int] = []
+        self.left: List[int] = []
+        self.right: List[int] = []
+        self.axis: List[int] = []
+        self.split: List[int] = []
+        self.lo: List[Tuple[int, int, int]] = []
+        self.hi: List[Tuple[int, int, int]] = []
+        stack = [(0, len(points), -1, False)]
+        while stack:
+            s, e, parent, is_right = stack.pop()
+            t = len(self.start)
+            if parent >= 0:
+                (self.right if is_right else self.left)[parent] = t
+            chunk = [points[i] for i in self.order[s:e]]
+            lo = tuple(min(p[a] for p in chunk) for a in range(3))
+            hi = tuple(max(p[a] for p in chunk) for a in range(3))
+            self.start.append(s)
+            self.end.append(e)
+            self.left.append(-1)
+            self.right.append(-1)
+            self.lo.append(lo)
+            self.hi.append(hi)
+            axis = max(range(3), key=lambda a: hi[a] - lo[a])
+            self.axis.append(axis)
+            if e - s <= leaf_size or hi[axis] == lo[axis]:
+                self.split.append(0)
+                continue
+            self.order[s:e] = sorted(self.order[s:e], key=lambda i: points[i][axis])
+            mid = (s + e) // 2
+            self.split.append(points[self.order[mid]][axis])
+            stack.append((mid, e, t, True))
+            stack.append((s, mid, t, False))
+
+
+def boruvka_mst(points: List[Tuple[int, int, int]], groups: Optional[DisjointSet] = None,
+                tree: Optional[KDTree] = None) -> List[Edge]:
+    """Borůvka's rounds with nearest-other-component queries through a k-d tree.
+
+    Each round every component picks its smallest outgoing edge in (d, i, j)
+    order; since that order is total, all picked edges belong to the MST and
+    at least half the components merge. Subtrees lying entirely inside the
+    querying point's component, or farther than its component's best edge so
+    far, are skipped. Memory is O(n); with groups, only the edges still
+    missing from that forest are returned.
+    """
+    n = len(points)
+    if groups is None:
+        groups = DisjointSet(n)
+    if tree is None:
+        tree = KDTree(points)
+    order, start, end = tree.order, tree.start, tree.end
+    left, right, axis, split = tree.left, tree.right, tree.axis, tree.split
+    box_lo, box_hi = tree.lo, tree.hi
+    n_nodes = len(start)
+    edges = []
+    while groups.components > 1:
+        comp = [groups.find(i) for i in range(n)]
+        # node_comp[t] = the component every point under t belongs to, or -1 if mixed
+        node_comp = [-1] * n_nodes
+        for t in range(n_nodes - 1, -1, -1):
+            if left[t] < 0:
+                c = comp[order[start[t]]]
+                if all(comp[order[u]] == c for u in range(start[t] + 1, end[t])):
+                    node_comp[t] = c
+            elif node_comp[left[t]] == node_comp[right[t]]:
+                node_comp[t] = node_comp[left[t]]
+
+        best = {}
+        for q in order:
+            cq = comp[q]
+            xq, yq, zq = points[q]
+            found = best.get(cq)
+            bound = found[0] if found else None
+            stack = [0]
+            while stack:
+                t = stack.pop()
+                if node_comp[t] == cq:
+                    continue
+                lo, hi = box_lo[t], box_hi[t]
+                dx = max(lo[0] - xq, 0, xq - hi[0])
+                dy = max(lo[1] - yq, 0, yq - hi[1])
+                dz = max(lo[2] - zq, 0, zq - hi[2])
+                if bound is not None and dx * dx + dy * dy + dz * dz > bound:
+                    continue
+                if left[t] < 0:
+                    for u in range(start[t], end[t]):
+                        j = order[u]
+                        if comp[j] == cq:
+                            continue
+                        xj, yj, zj = points[j]
+                        d = (xq - xj) ** 2 + (yq - yj) ** 2 + (zq - zj) ** 2
+                        if bound is None or d <= bound:
+                            key = (d, q, j) if q < j else (d, j, q)
+                            if found is None or key < found:
+                                found = key
+                                bound = d
+                    continue
+                # nearer child last, so it is popped first
+                if points[q][axis[t]] < split[t]:
+                    stack.append(right[t])
+                    stack.append(left[t])
+                else:
+                    stack.append(left[t])
+                    stack.append(right[t])
+            if found is not None:
+                best[cq] = found
+        for d, i, j in sorted(set(best.values())):
+            if groups.union(i, j):
+                edges.append((d, i, j))
+    return edges
+
+
+def grid_kruskal_mst(points: List[Tuple[int, int, int]], budget: int = 32) -> List[Edge]:
+    """Kruskal over growing distance shells found through day_8's spatial grid.
+
+    Each round only keeps pairs in the new shell that still join two different
+    components, so memory follows the shell rather than all n^2 pairs; the
+    edges are still processed in exact (d, i, j) order. The first shell is
+    sized from the points' nearest-neighbour spacing, so far outliers don't
+    inflate it. If a round has to look at more than budget * n pairs
+    (clustered input, where the later shells span whole clusters), the
+    forest built so far is finished by boruvka_mst instead.
+    """
+    n = len(points)
+    groups = DisjointSet(n)
+    # the longest MST edges sit well past the typical gap, so skip the tiny first shell
+    radius = max(1.0, 2 * nearest_neighbour_spacing(points))
+    find = groups.find
+    edges = []
+    done_limit = -1
+    max_seen = budget * n
+    while groups.components > 1:
+        limit = int(radius * radius)
+        shell = []
+        seen = 0
+        for d, i, j in pairs_within(points, limit):
+            seen += 1
+            if seen > max_seen:
+                return edges + boruvka_mst(points, groups)
+            if d > done_limit and find(i) != find(j):
+                shell.append((d, i, j))
+        shell.sort()
+        for d, i, j in shell:
+            if groups.union(i, j):
+                edges.append((d, i, j))
+                if groups.components == 1:
+                    break
+        done_limit = limit
+        radius *= 2
+        # doubling the radius finds about 8x the pairs; don't start a round that
+        # is bound to blow the budget
+        if groups.components > 1 and 8 * seen > max_seen:
+            return edges + boruvka_mst(points, groups)
+    return edges
+
+
+def euclidean_mst(points: List[Tuple[int, int, int]], method: str = "auto") -> Tuple[Optional[Edge], List[Edge]]:
+    """Minimum spanning tree under (d, i, j) order and the edge Kruskal would add last."""
+    if len(points) < 2:
+        return None, []
+    if method == "auto":
+        method = "prim" if len(points) <= 5000 else "grid"
+    if method == "prim":
+        edges = prim_mst(points)
+    elif method == "boruvka":
+        edges = boruvka_mst(points)
+    else:
+        edges = grid_kruskal_mst(points)
+    return max(edges), edges
+
+
+def find_last_connection(points: List[Tuple[int, int, int]], method: str = "auto") -> int:
+    last, _ = euclidean_mst(points, method)
+    if last is None:
         return 0
+    _, i, j = last
+    # Return product of X coordinates of the final connected pair
+    return points[i][0] * points[j][0]
+
 
-    # Build list of all pairs (squared distance, i, j)
-    pairs = []
-    for i in range(n):
-        xi, yi, zi = points[i]
-        for j in range(i + 1, n):
-            xj, yj, zj = points[j]
-            d = (xi - xj) ** 2 + (yi - yj) ** 2 + (zi - zj) ** 2
-            pairs.append((d, i, j))
-
-    # Sort by distance (then by indices to break ties deterministically)
-    pairs.sort()
-
-    # Disjoint-set (union-find) with path compression and union by size
-    parent = list(range(n))
-    size = [1] * n
-
-    def find(a: int) -> int:
-        while parent[a] != a:
-            parent[a] = parent[parent[a]]
-            a = parent[a]
-        return a
-
-    def union(a: int, b: int) -> bool:
-        ra, rb = find(a), find(b)
-        if ra == rb:
-            return False
-        if size[ra] < size[rb]:
-            ra, rb = rb, ra
-        parent[rb] = ra
-        size[ra] += size[rb]
-        return True
-
-    components = n
-    for _, i, j in pairs:
-        if union(i, j):
-            components -= 1
-            if components == 1:
-                # Return product of X coordinates of the final connected pair
-                return points[i][0] * points[j][0]
-
-    return 0
-
-
-def main(path: str = "day_8/day_8_input.txt") -> int:
+def main(path: str = "day_8/day_8_input.txt", method: str = "auto") -> int:
     with open(path, 'r') as f:
         points = []
         for line in f:
             if line.strip():
                 parts = list(map(int, line.strip().split(',')))
                 points.append((parts[0], parts[1], parts[2]))
-    return find_last_connection(points)
+    return find_last_connection(points, method)
 
 
 if __name__ == "__main__":
-    print(main())
\ No newline at end of file
+    print(main())
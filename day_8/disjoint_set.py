@@ -0,0 +1,101 @@
+from array import array
+from collections import Counter
+from heapq import nlargest
+from typing import Iterable, List, Tuple
+
+
+class DisjointSet:
+    """Union-find over 0..n-1 with union by size and path halving.
+
+    Parents and sizes live in array('i') rather than lists, and a histogram of
+    component sizes is kept up to date on every merge, so asking for the
+    biggest components never has to walk all n elements.
+    """
+
+    __slots__ = ("parent", "size", "components", "size_counts")
+
+    def __init__(self, n: int):
+        self.parent = array('i', range(n))
+        self.size = array('i', [1]) * n
+        self.components = n
+        self.size_counts = Counter({1: n}) if n else Counter()
+
+    def __len__(self) -> int:
+        return len(self.parent)
+
+    def find(self, a: int) -> int:
+        parent = self.parent
+        while parent[a] != a:
+            parent[a] = parent[parent[a]]
+            a = parent[a]
+        return a
+
+    def _link(self, ra: int, rb: int) -> None:
+        size = self.size
+        sa, sb = size[ra], size[rb]
+        if sa < sb:
+            ra, rb = rb, ra
+        self.parent[rb] = ra
+        size[ra] = sa + sb
+        self.components -= 1
+        counts = self.size_counts
+        for s in (sa, sb):
+            if counts[s] == 1:
+                del counts[s]
+            else:
+                counts[s] -= 1
+        counts[sa + sb] += 1
+
+    def union(self, a: int, b: int) -> bool:
+        ra, rb = self.find(a), self.find(b)
+        if ra == rb:
+            return False
+        self._link(ra, rb)
+        return True
+
+    def union_many(self, pairs: Iterable[Tuple[int, int]]) -> int:
+        """Union every (a, b) pair in order; returns how many actually merged."""
+        parent, size, counts = self.parent, self.size, self.size_counts
+        merged = 0
+        for a, b in pairs:
+            # find() and _link() inlined, this is the hot loop
+            while parent[a] != a:
+                parent[a] = parent[parent[a]]
+                a = parent[a]
+            while parent[b] != b:
+                parent[b] = parent[parent[b]]
+                b = parent[b]
+            if a == b:
+                continue
+            sa, sb = size[a], size[b]
+            if sa < sb:
+                a, b = b, a
+            parent[b] = a
+            size[a] = sa + sb
+            merged += 1
+            for s in (sa, sb):
+                if counts[s] == 1:
+                    del counts[s]
+                else:
+                    counts[s] -= 1
+            counts[sa + sb] += 1
+        self.components -= merged
+        return merged
+
+    def top_sizes(self, k: int) -> List[int]:
+        """The k largest component sizes, descending.
+
+        Only distinct sizes are looked at, and there are at most about
+        sqrt(2n) of those, so this does not depend on how many elements
+        there are.
+        """
+        sizes: List[int] = []
+        for s in nlargest(k, self.size_counts):
+            sizes.extend([s] * min(self.size_counts[s], k - len(sizes)))
+            if len(sizes) == k:
+                break
+        return sizes
+
+    def component_sizes(self) -> List[int]:
+        """Every component size, descending."""
+        return self.top_sizes(self.components)
@@ -37,6 +37,75 @@ def get_max_area(points: list[tuple[int, int]]) -> int:
     
     return max_area
     
-lines = parse_file("/home/bret/Work/Advent of Code 2025/day_9/input.txt")
-result = get_max_area(lines)
-print(f"Largest rectangle area: {result}")
\ No newline at end of file
+def staircase(points: list[tuple[int, int]]) -> list[tuple[int, int]]:
+    """Points no other point beats on both x and y (lower-left Pareto frontier).
+
+    Returned sorted by x ascending, which makes y strictly descending.
+    """
+    chain = []
+    for x, y in sorted(set(points)):
+        if not chain or y < chain[-1][1]:
+            chain.append((x, y))
+    return chain
+
+
+def _corner_area(p: tuple[int, int], q: tuple[int, int]) -> float:
+    dx = q[0] - p[0]
+    dy = q[1] - p[1]
+    if dx >= 0 and dy >= 0:
+        return (dx + 1) * (dy + 1)
+    if dx < 0 and dy < 0:
+        return float('-inf')
+    # q only beats p on one axis: negative, and more negative the further off it is,
+    # which keeps the best column monotone for the divide and conquer below
+    return dx * dy
+
+
+def _best_across(low: list[tuple[int, int]], high: list[tuple[int, int]]) -> float:
+    """Largest rectangle with a corner on each chain.
+
+    The best partner in `high` only moves right as we move right along `low`,
+    so solve the middle row by scanning, then split the column range for the
+    two halves (monotone-matrix divide and conquer, O((a + b) log a)).
+    """
+    best = float('-inf')
+    stack = [(0, len(low) - 1, 0, len(high) - 1)]
+    while stack:
+        lo, hi, opt_lo, opt_hi = stack.pop()
+        if lo > hi:
+            continue
+        mid = (lo + hi) // 2
+        p = low[mid]
+        mid_best, mid_opt = float('-inf'), opt_lo
+        for j in range(opt_lo, opt_hi + 1):
+            area = _corner_area(p, high[j])
+            if area > mid_best:
+                mid_best, mid_opt = area, j
+        best = max(best, mid_best)
+        stack.append((lo, mid - 1, opt_lo, mid_opt))
+        stack.append((mid + 1, hi, mid_opt, opt_hi))
+    return best
+
+
+def get_max_area_staircase(points: list[tuple[int, int]]) -> int:
+    """Same answer as get_max_area, searching only the Pareto staircases.
+
+    Opposite corners of the best rectangle can always be pushed out to the
+    lower-left / upper-right chains (or upper-left / lower-right), so only
+    pairs across those chains are tried.
+    """
+    if len(points) < 2:
+        return 0
+    best = float('-inf')
+    for flip in (1, -1):    # flip x to turn upper-left / lower-right into the same problem
+        pts = [(flip * x, y) for x, y in points]
+        low = staircase(pts)
+        high = sorted((-x, -y) for x, y in staircase([(-x, -y) for x, y in pts]))
+        best = max(best, _best_across(low, high))
+    return int(best)
+
+
+if __name__ == "__main__":
+    lines = parse_file("/home/bret/Work/Advent of Code 2025/day_9/input.txt")
+    result = get_max_area_staircase(lines)
+    print(f"Largest rectangle area: {result}")
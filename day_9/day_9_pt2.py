@@ -1,8 +1,15 @@
 from pprint import pprint
-from heapq import heappop, heappush
+from heapq import heappop, heappush, nsmallest
+from bisect import bisect_left, bisect_right
 from collections import defaultdict
+from itertools import accumulate
 from pathlib import Path
 
+try:
+    import numpy as np
+except ImportError:      # numpy only speeds up the prefix-sum scan
+    np = None
+
 
 def read_input_file(file_path: str) -> list[str]:
     # Resolve paths relative to this script so the file is found
@@ -30,6 +37,91 @@ def order(o1: int, o2: int) -> tuple:
     return (min(o1, o2), max(o1, o2))
 
 
+class SegmentIndex:
+    """Polygon edges along one axis, built once and queried per candidate.
+
+    Edges are sorted by their fixed coordinate and put in a segment tree;
+    each node keeps its edges sorted by start with a running max of ends, so
+    "is there an edge strictly between pos_min and pos_max that overlaps
+    (lo, hi)" is O(log^2 E) instead of a scan over every edge.
+    """
+
+    def __init__(self, segments: dict):
+        edges = sorted((pos, s, e) for pos, spans in segments.items() for s, e in spans)
+        self.positions = [pos for pos, _, _ in edges]
+        n = self.n = len(edges)
+        starts = [[] for _ in range(2 * n)]
+        max_ends = [[] for _ in range(2 * n)]
+        for i, (_, s, e) in enumerate(edges):
+            starts[n + i] = [s]
+            max_ends[n + i] = [e]
+        for node in range(n - 1, 0, -1):
+            merged = sorted(zip(starts[2 * node] + starts[2 * node + 1],
+                                max_ends[2 * node] + max_ends[2 * node + 1]))
+            starts[node] = [s for s, _ in merged]
+            running, best = [], None
+            for _, e in merged:
+                best = e if best is None or e > best else best
+                running.append(best)
+            max_ends[node] = running
+        self.starts = starts
+        self.max_ends = max_ends
+
+    def _hits(self, node: int, lo: int, hi: int) -> bool:
+        k = bisect_left(self.starts[node], hi)     # edges starting before hi...
+        return k > 0 and self.max_ends[node][k - 1] > lo    # ...and one of them ends after lo
+
+    def crosses(self, pos_min: int, pos_max: int, lo: int, hi: int) -> bool:
+        left = bisect_right(self.positions, pos_min) + self.n
+        right = bisect_left(self.positions, pos_max) + self.n
+        while left < right:
+            if left & 1:
+                if self._hits(left, lo, hi):
+                    return True
+                left += 1
+            if right & 1:
+                right -= 1
+                if self._hits(right, lo, hi):
+                    return True
+            left >>= 1
+            right >>= 1
+        return False
+
+
+def iter_candidates(tiles: list, batch: int = 256):
+    """Yield (area, i, j) for every pair of tiles, largest area first.
+
+    Same order as pushing every pair into one heap (ties by i, then j), but
+    each tile only keeps a buffer of its next `batch` partners, refilled by a
+    scan when it runs dry, and the heap holds one entry per tile: O(n * batch)
+    memory instead of O(n^2).
+    """
+    n = len(tiles)
+
+    def next_partners(i: int, after: tuple = None) -> list:
+        x1, y1 = tiles[i]
+        keys = (((-(abs(x1 - x2) + 1) * (abs(y1 - y2) + 1)), j) for j, (x2, y2) in enumerate(tiles[i + 1:], i + 1))
+        if after is not None:
+            keys = (key for key in keys if key > after)
+        return nsmallest(batch, keys)[::-1]    # reversed so pop() hands out the next one
+
+    buffers = {}
+    frontier = []
+    for i in range(n - 1):
+        buffers[i] = next_partners(i)
+        area, j = buffers[i].pop()
+        heappush(frontier, (area, i, j))
+
+    while frontier:
+        area, i, j = heappop(frontier)
+        yield -area, i, j
+        if not buffers[i]:
+            buffers[i] = next_partners(i, (area, j))
+        if buffers[i]:
+            next_area, next_j = buffers[i].pop()
+            heappush(frontier, (next_area, i, next_j))
+
+
 @measure_time
 def solution(lines: list[str]):
     tiles = [tuple(map(int, line.split(','))) for line in lines]
@@ -37,10 +129,6 @@ def solution(lines: list[str]):
     v_segments = defaultdict(list)
     h_segments = defaultdict(list)
 
-    areas = []
-    rid_to_pair = {}
-
-    rid = 0
     n = len(tiles)
 
     # Store Segments
@@ -53,63 +141,144 @@ def solution(lines: list[str]):
         else:
             h_segments[y1].append(order(x1, x2))
 
-    # Push All Possible Areas In A Heap
-    for i in range(n-1):
-        for j in range(i+1, n):
-            x1, y1 = tiles[i]
-            x2, y2 = tiles[j]
-            area = (abs(x1-x2)+1) * (abs(y1-y2)+1)
-
-            heappush(areas, (-area, rid))
-            rid_to_pair[rid] = (tiles[i], tiles[j])
-            rid += 1
-    
-    while areas:
-        area, rid = heappop(areas)
-        p1, p2 = rid_to_pair[rid]
-        
+    # Index Segments Once
+    v_index = SegmentIndex(v_segments)
+    h_index = SegmentIndex(h_segments)
+
+    # Candidates Come Out Largest First, Generated On Demand
+    for area, i, j in iter_candidates(tiles):
+        p1, p2 = tiles[i], tiles[j]
+
         x1, y1 = p1
         x2, y2 = p2
 
         x_min, x_max = sorted((x1, x2))
         y_min, y_max = sorted((y1, y2))
-        
-        is_valid = True
-
-        # Check Vertical Segments
-        for x, segments in v_segments.items():
-            if not (x_min < x < x_max):
-                continue
-
-            for ys, ye in segments:
-                if ye > y_min and ys < y_max:
-                    is_valid = False
-                    break
-            
-            if not is_valid:
-                break
-        
-        if not is_valid:
+
+        # Any Vertical Or Horizontal Edge Crossing The Interior?
+        if v_index.crosses(x_min, x_max, y_min, y_max):
+            continue
+        if h_index.crosses(y_min, y_max, x_min, x_max):
             continue
 
-        # Check Horizontal Segments
-        for y, segments in h_segments.items():
-            if not (y_min < y < y_max):
-                continue
+        print(area, p1, p2, True)
+        break
 
-            for xs, xe in segments:
-                if xe > x_min and xs < x_max:
-                    is_valid = False
-                    break
+class InsideTable:
+    """Polygon rasterized onto its compressed coordinates, with 2D prefix sums.
 
-            if not is_valid:
-                break
-        
-        if not is_valid:
-            continue
+    Compressed column 2k is x == xs[k] and column 2k + 1 is the open gap
+    between xs[k] and xs[k + 1] (rows likewise), so every cell is uniformly
+    inside or outside the polygon (boundary counts as inside). Prefix sums of
+    the outside cells that hold at least one tile make "is every tile of this
+    rectangle inside" O(1).
+    """
 
-        print(-area, p1, p2, is_valid)
-        break
+    def __init__(self, tiles: list):
+        xs = sorted({x for x, _ in tiles})
+        ys = sorted({y for _, y in tiles})
+        x_at = {x: k for k, x in enumerate(xs)}
+        y_at = {y: k for k, y in enumerate(ys)}
+        w, h = 2 * len(xs) - 1, 2 * len(ys) - 1
+        self.x_at, self.y_at = x_at, y_at
+
+        boundary = [bytearray(w) for _ in range(h)]
+        crossings = [[] for _ in range(h)]    # vertical edge columns crossing each gap row
+        n = len(tiles)
+        for i in range(n):
+            (x1, y1), (x2, y2) = tiles[i], tiles[(i + 1) % n]
+            cx1, cx2 = sorted((2 * x_at[x1], 2 * x_at[x2]))
+            cy1, cy2 = sorted((2 * y_at[y1], 2 * y_at[y2]))
+            for cy in range(cy1, cy2 + 1):
+                boundary[cy][cx1:cx2 + 1] = b'\x01' * (cx2 - cx1 + 1)
+            if cx1 == cx2:
+                for cy in range(cy1 + 1, cy2, 2):
+                    crossings[cy].append(cx1)
+
+        outside = [None] * h
+        # gap rows: ray cast left to right, inside between each pair of crossing edges
+        for cy in range(1, h, 2):
+            row = bytearray(b'\x01' * w)
+            flips = sorted(crossings[cy])
+            for a, b in zip(flips[::2], flips[1::2]):
+                row[a:b + 1] = bytes(b - a + 1)
+            outside[cy] = row
+        # rows on a vertex y: off the boundary they match the gap row next to them
+        ones = int.from_bytes(b'\x01' * w, 'little')
+        for cy in range(0, h, 2):
+            near = outside[cy - 1] if cy > 0 else outside[cy + 1] if cy + 1 < h else b'\x01' * w
+            off_edge = int.from_bytes(boundary[cy], 'little') ^ ones
+            outside[cy] = (int.from_bytes(near, 'little') & off_edge).to_bytes(w, 'little')
+        # a gap between neighbouring integers holds no tiles, so it can't make a rectangle invalid
+        has_tiles = bytes(int(cx % 2 == 0 or xs[cx // 2 + 1] - xs[cx // 2] > 1) for cx in range(w))
+        has_tiles = int.from_bytes(has_tiles, 'little')
+        for cy in range(h):
+            if cy % 2 and ys[cy // 2 + 1] - ys[cy // 2] == 1:
+                outside[cy] = bytes(w)
+            else:
+                outside[cy] = (int.from_bytes(outside[cy], 'little') & has_tiles).to_bytes(w, 'little')
+
+        if np is not None:
+            table = np.zeros((h + 1, w + 1), dtype=np.int64)
+            table[1:, 1:] = np.frombuffer(b''.join(outside), dtype=np.uint8).reshape(h, w).cumsum(0).cumsum(1)
+            self.prefix = table
+        else:
+            prefix = [[0] * (w + 1)]
+            for row in outside:
+                prefix.append([a + b for a, b in zip(prefix[-1], accumulate(row, initial=0))])
+            self.prefix = prefix
+
+    def outside_cells(self, cx1: int, cy1: int, cx2: int, cy2: int) -> int:
+        p = self.prefix
+        return p[cy2 + 1][cx2 + 1] - p[cy1][cx2 + 1] - p[cy2 + 1][cx1] + p[cy1][cx1]
+
+    def contains(self, p1: tuple, p2: tuple) -> bool:
+        cx1, cx2 = sorted((2 * self.x_at[p1[0]], 2 * self.x_at[p2[0]]))
+        cy1, cy2 = sorted((2 * self.y_at[p1[1]], 2 * self.y_at[p2[1]]))
+        return self.outside_cells(cx1, cy1, cx2, cy2) == 0
+
+
+@measure_time
+def solution_prefix(lines: list[str]):
+    """Largest rectangle fully inside the polygon, every pair checked in O(1)."""
+    tiles = [tuple(map(int, line.split(','))) for line in lines]
+    table = InsideTable(tiles)
+    n = len(tiles)
+
+    best, best_pair = 0, None
+    if np is not None:
+        # one vectorized pass per tile against every later tile
+        pts = np.array(tiles, dtype=np.int64)
+        cx = np.array([2 * table.x_at[x] for x, _ in tiles])
+        cy = np.array([2 * table.y_at[y] for _, y in tiles])
+        p = table.prefix
+        for i in range(n - 1):
+            j = np.arange(i + 1, n)
+            area = (np.abs(pts[j, 0] - pts[i, 0]) + 1) * (np.abs(pts[j, 1] - pts[i, 1]) + 1)
+            x1, x2 = np.minimum(cx[i], cx[j]), np.maximum(cx[i], cx[j])
+            y1, y2 = np.minimum(cy[i], cy[j]), np.maximum(cy[i], cy[j])
+            outside = p[y2 + 1, x2 + 1] - p[y1, x2 + 1] - p[y2 + 1, x1] + p[y1, x1]
+            area = np.where(outside == 0, area, 0)
+            k = int(area.argmax())
+            if area[k] > best:
+                best, best_pair = int(area[k]), (tiles[i], tiles[i + 1 + k])
+    else:
+        for i in range(n - 1):
+            x1, y1 = tiles[i]
+            for j in range(i + 1, n):
+                x2, y2 = tiles[j]
+                area = (abs(x1-x2)+1) * (abs(y1-y2)+1)
+                if area > best and table.contains(tiles[i], tiles[j]):
+                    best, best_pair = area, (tiles[i], tiles[j])
+
+    if best_pair:
+        print(best, best_pair[0], best_pair[1], True)
+    return best
 
-lines = read_input_file(file_path="input.txt")
-solution(lines)
\ No newline at end of file
+if __name__ == "__main__":
+    import sys
+    lines = read_input_file(file_path="input.txt")
+    if "--prefix" in sys.argv[1:]:
+        solution_prefix(lines)
+    else:
+        solution(lines)